@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+MCP Load Generator
+
+Spawns one or more instances of the Python MCP server and drives them with real
+JSON-RPC over stdio: a configurable mix of tools/call, resources/read and
+prompts/get requests at an open-loop arrival rate with bounded concurrency.
+Reports throughput, latency percentiles and server RSS over time.
+
+Examples:
+    python3 load_test.py --rate 50 --duration 30
+    python3 load_test.py --servers 4 --rate 200 --concurrency 64 \\
+        --mix "sqlite-query=5,generate-data=2,calculate=2,resources/read=1,prompts/get=1"
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+import psutil
+
+SERVER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "src", "server.py")
+PROTOCOL_VERSION = "2024-11-05"
+DEFAULT_MIX = "sqlite-query=4,generate-data=2,calculate=2,resources/read=1,prompts/get=1"
+# The server reports tool failures as text results rather than with isError
+TOOL_ERROR_PREFIXES = ("Error:", "SQLite Error:", "MySQL Error:")
+
+
+def build_request(kind: str, database: str) -> Dict[str, Any]:
+    """Return the JSON-RPC method and params for one request of the given kind."""
+    if kind == "sqlite-query":
+        return {"method": "tools/call", "params": {"name": "sqlite-query", "arguments": {
+            "database": database,
+            "query": random.choice([
+                "SELECT * FROM users ORDER BY name",
+                "SELECT status, COUNT(*) AS count, AVG(total) AS avg_total FROM orders GROUP BY status",
+                "SELECT u.name, p.name AS product, o.total FROM orders o "
+                "JOIN users u ON o.user_id = u.id JOIN products p ON o.product_id = p.id",
+            ])
+        }}}
+    if kind == "generate-data":
+        return {"method": "tools/call", "params": {"name": "generate-data", "arguments": {
+            "type": random.choice(["user", "product", "order"]),
+            "count": random.randint(1, 10)
+        }}}
+    if kind == "calculate":
+        return {"method": "tools/call", "params": {"name": "calculate", "arguments": {
+            "operation": random.choice(["add", "subtract", "multiply", "divide"]),
+            "a": random.randint(1, 1000),
+            "b": random.randint(1, 1000)
+        }}}
+    if kind == "resources/read":
+        return {"method": "resources/read", "params": {
+            "uri": random.choice(["file://README.md", f"user://profile/{random.randint(1, 100)}"])
+        }}
+    if kind == "prompts/get":
+        return {"method": "prompts/get", "params": {"name": "explain-concept", "arguments": {
+            "concept": "Model Context Protocol",
+            "audience": "intermediate"
+        }}}
+    raise ValueError(f"Unknown request kind {kind}")
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """Parse a "kind=weight,kind=weight" request mix."""
+    mix = {}
+    for item in spec.split(","):
+        kind, _, weight = item.strip().partition("=")
+        build_request(kind, "")  # validates the kind
+        mix[kind] = float(weight or 1)
+    return mix
+
+
+def is_failure(response: Dict[str, Any]) -> bool:
+    """Return whether a JSON-RPC response is an error or a failed tool result."""
+    if "error" in response:
+        return True
+    result = response.get("result", {})
+    if result.get("isError", False):
+        return True
+    return any(
+        content.get("type") == "text" and content.get("text", "").startswith(TOOL_ERROR_PREFIXES)
+        for content in result.get("content", [])
+    )
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[index]
+
+
+class ServerProcess:
+    """One spawned MCP server speaking newline-delimited JSON-RPC over stdio."""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self.pending: Dict[int, asyncio.Future] = {}
+        self.next_id = 0
+        self._reader: Optional[asyncio.Task] = None
+
+    async def start(self):
+        self.process = await asyncio.create_subprocess_exec(
+            sys.executable, SERVER_SCRIPT,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            limit=64 * 1024 * 1024
+        )
+        self._reader = asyncio.get_running_loop().create_task(self._read_responses())
+        await self.request("initialize", {
+            "protocolVersion": PROTOCOL_VERSION,
+            "capabilities": {},
+            "clientInfo": {"name": "mcp-load-test", "version": "1.0.0"}
+        })
+        await self.notify("notifications/initialized")
+
+    async def _read_responses(self):
+        while True:
+            line = await self.process.stdout.readline()
+            if not line:
+                break
+            message = json.loads(line)
+            future = self.pending.pop(message.get("id"), None)
+            if future is not None and not future.done():
+                future.set_result(message)
+        for future in self.pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError("Server closed stdout"))
+
+    async def _send(self, message: Dict[str, Any]):
+        self.process.stdin.write(json.dumps(message).encode("utf-8") + b"\n")
+        await self.process.stdin.drain()
+
+    async def request(self, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        self.next_id += 1
+        future = asyncio.get_running_loop().create_future()
+        self.pending[self.next_id] = future
+        await self._send({"jsonrpc": "2.0", "id": self.next_id, "method": method, "params": params})
+        return await future
+
+    async def notify(self, method: str):
+        await self._send({"jsonrpc": "2.0", "method": method})
+
+    def rss(self) -> Optional[int]:
+        try:
+            return psutil.Process(self.process.pid).memory_info().rss
+        except psutil.Error:
+            return None
+
+    async def stop(self):
+        self.process.stdin.close()
+        try:
+            await asyncio.wait_for(self.process.wait(), timeout=5)
+        except asyncio.TimeoutError:
+            self.process.kill()
+            await self.process.wait()
+        if self._reader is not None:
+            self._reader.cancel()
+
+
+async def sample_rss(servers: List[ServerProcess], interval: float, start: float, samples: List[Dict[str, Any]]):
+    while True:
+        samples.append({
+            "elapsed": round(time.perf_counter() - start, 2),
+            "rss": [server.rss() for server in servers]
+        })
+        await asyncio.sleep(interval)
+
+
+async def run_load(args) -> Dict[str, Any]:
+    mix = parse_mix(args.mix)
+    kinds = list(mix)
+    weights = [mix[kind] for kind in kinds]
+
+    servers = [ServerProcess(i) for i in range(args.servers)]
+    await asyncio.gather(*(server.start() for server in servers))
+    # All instances share one database file; create the sample tables once
+    await servers[0].request("tools/call", {"name": "sqlite-query", "arguments": {
+        "action": "init", "database": args.database, "query": "CREATE SAMPLE DATABASE"
+    }})
+
+    latencies: Dict[str, List[float]] = {kind: [] for kind in kinds}
+    errors: Dict[str, int] = {kind: 0 for kind in kinds}
+    semaphore = asyncio.Semaphore(args.concurrency)
+    in_flight = set()
+    rss_samples: List[Dict[str, Any]] = []
+
+    async def fire(kind: str, server: ServerProcess, scheduled: float):
+        async with semaphore:
+            request = build_request(kind, args.database)
+            try:
+                response = await server.request(request["method"], request["params"])
+                failed = is_failure(response)
+            except Exception:
+                failed = True
+        # Latency is measured from the scheduled arrival to avoid coordinated omission
+        latencies[kind].append(time.perf_counter() - scheduled)
+        if failed:
+            errors[kind] += 1
+
+    start = time.perf_counter()
+    sampler = asyncio.get_running_loop().create_task(sample_rss(servers, args.rss_interval, start, rss_samples))
+    deadline = start + args.duration
+    next_arrival = start
+    sent = 0
+    while True:
+        if args.rate > 0:
+            # Open loop: Poisson arrivals independent of response times
+            next_arrival += random.expovariate(args.rate)
+            delay = next_arrival - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        else:
+            # Closed loop: keep exactly `concurrency` requests in flight
+            await semaphore.acquire()
+            semaphore.release()
+            next_arrival = time.perf_counter()
+        if next_arrival >= deadline:
+            break
+        kind = random.choices(kinds, weights)[0]
+        task = asyncio.get_running_loop().create_task(fire(kind, servers[sent % len(servers)], next_arrival))
+        in_flight.add(task)
+        task.add_done_callback(in_flight.discard)
+        sent += 1
+        if args.rate <= 0:
+            await asyncio.sleep(0)
+
+    if in_flight:
+        await asyncio.gather(*in_flight)
+    elapsed = time.perf_counter() - start
+    sampler.cancel()
+    rss_samples.append({"elapsed": round(elapsed, 2), "rss": [server.rss() for server in servers]})
+
+    await servers[0].request("tools/call", {"name": "sqlite-query", "arguments": {
+        "action": "drop", "database": args.database, "query": "DROP DATABASE"
+    }})
+    await asyncio.gather(*(server.stop() for server in servers))
+
+    all_latencies = sorted(value for values in latencies.values() for value in values)
+    completed = len(all_latencies)
+
+    def summarize(values: List[float]) -> Dict[str, float]:
+        values = sorted(values)
+        return {
+            "count": len(values),
+            "p50Ms": round(percentile(values, 50) * 1000, 2),
+            "p90Ms": round(percentile(values, 90) * 1000, 2),
+            "p99Ms": round(percentile(values, 99) * 1000, 2),
+            "maxMs": round(values[-1] * 1000, 2) if values else 0.0
+        }
+
+    return {
+        "servers": args.servers,
+        "targetRate": args.rate,
+        "concurrency": args.concurrency,
+        "durationSeconds": round(elapsed, 2),
+        "sent": sent,
+        "completed": completed,
+        "errors": sum(errors.values()),
+        "throughput": round(completed / elapsed, 2) if elapsed else 0.0,
+        "latency": summarize(all_latencies),
+        "byKind": {kind: {**summarize(latencies[kind]), "errors": errors[kind]} for kind in kinds},
+        "rss": rss_samples
+    }
+
+
+def print_report(report: Dict[str, Any]):
+    print("📈 MCP Load Test Results")
+    print("=" * 50)
+    print(f"Servers: {report['servers']}  Target rate: {report['targetRate'] or 'closed loop'}  "
+          f"Concurrency: {report['concurrency']}")
+    print(f"Duration: {report['durationSeconds']}s  Sent: {report['sent']}  "
+          f"Completed: {report['completed']}  Errors: {report['errors']}")
+    print(f"Throughput: {report['throughput']} req/s")
+    latency = report["latency"]
+    print(f"Latency: p50 {latency['p50Ms']}ms  p90 {latency['p90Ms']}ms  "
+          f"p99 {latency['p99Ms']}ms  max {latency['maxMs']}ms")
+    print("\nBy request kind:")
+    for kind, stats in report["byKind"].items():
+        print(f"   - {kind}: {stats['count']} requests, {stats['errors']} errors, "
+              f"p50 {stats['p50Ms']}ms, p99 {stats['p99Ms']}ms")
+    print("\nServer RSS (MB):")
+    for sample in report["rss"]:
+        rss = ", ".join(f"{value / 1024 / 1024:.1f}" if value else "-" for value in sample["rss"])
+        print(f"   {sample['elapsed']:>8}s  {rss}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Drive MCP server instances with JSON-RPC load over stdio")
+    parser.add_argument("--servers", type=int, default=1, help="Number of server instances to spawn")
+    parser.add_argument("--rate", type=float, default=20.0,
+                        help="Open-loop arrival rate in requests/second (0 for closed loop)")
+    parser.add_argument("--concurrency", type=int, default=16, help="Maximum requests in flight")
+    parser.add_argument("--duration", type=float, default=10.0, help="Test duration in seconds")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Request mix as kind=weight pairs")
+    parser.add_argument("--database", default="loadtest.db", help="SQLite database used by sqlite-query requests")
+    parser.add_argument("--rss-interval", type=float, default=1.0, help="Seconds between server RSS samples")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_load(args))
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+    return 0 if report["errors"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
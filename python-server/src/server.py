@@ -9,21 +9,55 @@ This server demonstrates the core Model Context Protocol capabilities:
 - Prompts: Reusable templates
 """
 
+import ast
 import asyncio
+import base64
+import collections
+import concurrent.futures
+import contextlib
+import contextvars
+import cProfile
+import hashlib
+import hmac
+import io
 import json
 import logging
+import logging.handlers
+import queue
+import threading
+import tracemalloc
+import urllib.request
 import sys
+import time
 import datetime
+import decimal
 import platform
+import pstats
 import random
+import re
 import sqlite3
+import math
+import operator
 import os
-from typing import Any, Dict, List, Optional
+import multiprocessing
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Tuple
 
+import anyio
 import mysql.connector
 from mysql.connector import Error as MySQLError
 import psutil
 
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; batch calculate falls back to a plain loop
+    np = None
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; responses fall back to the stdlib encoder
+    orjson = None
+
 from mcp.server.models import InitializationOptions
 import mcp.types as types
 from mcp.server import NotificationOptions, Server
@@ -36,6 +70,1690 @@ logger = logging.getLogger(__name__)
 # Create the MCP server instance
 server = Server("example-mcp-server")
 
+# Directory that relative database and config paths are resolved against
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Request tracing configuration (disabled unless an exporter is configured)
+TRACE_FILE = os.environ.get("MCP_TRACE_FILE")
+TRACE_FILE_MAX_BYTES = int(os.environ.get("MCP_TRACE_FILE_MAX_BYTES", str(10 * 1024 * 1024)))
+TRACE_FILE_BACKUPS = int(os.environ.get("MCP_TRACE_FILE_BACKUPS", "3"))
+TRACE_OTLP_ENDPOINT = os.environ.get("MCP_TRACE_OTLP_ENDPOINT")
+TRACE_SAMPLE_RATES = os.environ.get("MCP_TRACE_SAMPLE_RATES", "*=1.0")
+
+# Admin tools are only exposed when a token is configured
+ADMIN_TOKEN = os.environ.get("MCP_ADMIN_TOKEN")
+PROFILE_DIR = os.environ.get("MCP_PROFILE_DIR", os.path.join(SERVER_DIR, "profiles"))
+
+# Background system sampler configuration
+SYSTEM_SAMPLE_INTERVAL = float(os.environ.get("MCP_SYSTEM_SAMPLE_INTERVAL", "5"))
+SYSTEM_SAMPLE_HISTORY = int(os.environ.get("MCP_SYSTEM_SAMPLE_HISTORY", "120"))
+
+
+class SystemSampler:
+    """Periodically samples system metrics into a cached snapshot.
+
+    Tool calls read the latest snapshot instead of querying psutil on demand,
+    and a fixed-size ring buffer keeps recent samples for trend requests.
+    """
+
+    def __init__(self, interval: float, history_size: int):
+        self.interval = interval
+        self.history: collections.deque = collections.deque(maxlen=history_size)
+        self.snapshot: Optional[Dict[str, Any]] = None
+        self._process = psutil.Process()
+        self._task: Optional[asyncio.Task] = None
+        # Prime the CPU counters so the first real sample is meaningful
+        psutil.cpu_percent(percpu=True)
+        self._process.cpu_percent()
+
+    def sample(self) -> Dict[str, Any]:
+        """Take a new sample and store it as the current snapshot."""
+        memory = psutil.virtual_memory()
+        disk = psutil.disk_io_counters()
+        net = psutil.net_io_counters()
+        try:
+            load = list(psutil.getloadavg())
+        except (AttributeError, OSError):
+            load = None
+
+        with self._process.oneshot():
+            process = {
+                "pid": self._process.pid,
+                "rss": self._process.memory_info().rss,
+                "threads": self._process.num_threads(),
+                "cpuPercent": self._process.cpu_percent(),
+                "fds": self._process.num_fds() if hasattr(self._process, "num_fds") else None
+            }
+
+        snapshot = {
+            "timestamp": datetime.datetime.now().isoformat(),
+            "cpu": {
+                "perCore": psutil.cpu_percent(percpu=True),
+                "count": psutil.cpu_count()
+            },
+            "loadAverage": load,
+            "memory": {
+                "total": memory.total,
+                "available": memory.available,
+                "used": memory.used,
+                "percent": memory.percent
+            },
+            "diskIO": {
+                "readBytes": disk.read_bytes,
+                "writeBytes": disk.write_bytes,
+                "readCount": disk.read_count,
+                "writeCount": disk.write_count
+            } if disk else None,
+            "networkIO": {
+                "bytesSent": net.bytes_sent,
+                "bytesRecv": net.bytes_recv,
+                "packetsSent": net.packets_sent,
+                "packetsRecv": net.packets_recv
+            } if net else None,
+            "process": process
+        }
+
+        self.snapshot = snapshot
+        self.history.append(snapshot)
+        return snapshot
+
+    def latest(self) -> Dict[str, Any]:
+        """Return the cached snapshot, sampling once if none exists yet."""
+        if self.snapshot is None:
+            return self.sample()
+        return self.snapshot
+
+    def recent(self, count: int) -> List[Dict[str, Any]]:
+        """Return up to ``count`` of the most recent samples, oldest first.
+
+        ``count`` is clamped to ``1..len(history)``.
+        """
+        if not self.history:
+            self.sample()
+        count = max(1, min(count, len(self.history)))
+        return list(self.history)[-count:]
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                await loop.run_in_executor(None, self.sample)
+            except Exception as e:
+                logger.warning(f"System sampler error: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        """Start the background sampling task on the running event loop."""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Cancel the background sampling task."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+system_sampler = SystemSampler(SYSTEM_SAMPLE_INTERVAL, SYSTEM_SAMPLE_HISTORY)
+
+
+class Span:
+    """A timed stage of a traced request."""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start_ns", "end_ns", "_start_perf", "attributes")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self._start_perf = time.perf_counter_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def finish(self):
+        self.end_ns = self.start_ns + time.perf_counter_ns() - self._start_perf
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id,
+            "name": self.name,
+            "start": self.start_ns,
+            "durationMs": round((self.end_ns - self.start_ns) / 1e6, 3),
+            "attributes": self.attributes
+        }
+
+
+class NoopSpan:
+    """Stand-in yielded when the current request is not sampled."""
+
+    def set(self, **attributes):
+        pass
+
+
+NOOP_SPAN = NoopSpan()
+
+
+class Tracer:
+    """Per-request tracing with a rotating NDJSON file and/or OTLP/HTTP exporter.
+
+    A root span is started for each tool call according to the per-tool sample
+    rate; stages inside the call open child spans through ``span()``, which
+    costs a single context variable lookup when the request is not sampled.
+    """
+
+    def __init__(self, trace_file: Optional[str], otlp_endpoint: Optional[str], sample_rates: str):
+        self.current: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("current_span", default=None)
+        self.rates: Dict[str, float] = {}
+        for item in sample_rates.split(","):
+            tool, _, rate = item.strip().partition("=")
+            if tool:
+                self.rates[tool] = float(rate or 1)
+        self.pending_writes: Dict[Any, Span] = {}
+        self.file_logger: Optional[logging.Logger] = None
+        if trace_file:
+            handler = logging.handlers.RotatingFileHandler(
+                os.path.join(SERVER_DIR, trace_file),
+                maxBytes=TRACE_FILE_MAX_BYTES,
+                backupCount=TRACE_FILE_BACKUPS,
+                encoding="utf-8"
+            )
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            self.file_logger = logging.getLogger("mcp.trace")
+            self.file_logger.addHandler(handler)
+            self.file_logger.setLevel(logging.INFO)
+            self.file_logger.propagate = False
+        self.otlp_endpoint = otlp_endpoint
+        self.otlp_queue: Optional[queue.Queue] = None
+        if otlp_endpoint:
+            self.otlp_queue = queue.Queue(maxsize=10000)
+            threading.Thread(target=self._otlp_worker, name="otlp-exporter", daemon=True).start()
+        self.enabled = bool(self.file_logger or self.otlp_queue)
+
+    def sample(self, tool: str) -> bool:
+        rate = self.rates.get(tool, self.rates.get("*", 0.0))
+        return rate >= 1.0 or (rate > 0 and random.random() < rate)
+
+    @contextlib.contextmanager
+    def trace(self, name: str, tool: str, **attributes):
+        """Open the root span of a request if tracing is enabled and it is sampled."""
+        if not self.enabled or not self.sample(tool):
+            yield NOOP_SPAN
+            return
+        span = Span(name, os.urandom(16).hex(), None, {"tool": tool, **attributes})
+        token = self.current.set(span)
+        try:
+            yield span
+        finally:
+            self.current.reset(token)
+            span.finish()
+            self.export(span)
+            request_id = attributes.get("requestId")
+            if request_id is not None:
+                self.pending_writes[request_id] = span
+
+    @contextlib.contextmanager
+    def span(self, name: str, **attributes):
+        """Open a child span of the current request's span."""
+        parent = self.current.get()
+        if parent is None:
+            yield NOOP_SPAN
+            return
+        span = Span(name, parent.trace_id, parent.span_id, attributes)
+        token = self.current.set(span)
+        try:
+            yield span
+        finally:
+            self.current.reset(token)
+            span.finish()
+            self.export(span)
+
+    def export(self, span: Span):
+        if self.file_logger is not None:
+            self.file_logger.info(json.dumps(span.to_dict(), default=str))
+        if self.otlp_queue is not None:
+            try:
+                self.otlp_queue.put_nowait(span)
+            except queue.Full:
+                pass  # drop spans rather than block the server
+
+    def _otlp_worker(self):
+        while True:
+            batch = [self.otlp_queue.get()]
+            time.sleep(1)
+            while not self.otlp_queue.empty() and len(batch) < 512:
+                batch.append(self.otlp_queue.get_nowait())
+            spans = []
+            for span in batch:
+                attributes = []
+                for key, value in span.attributes.items():
+                    if isinstance(value, bool):
+                        encoded = {"boolValue": value}
+                    elif isinstance(value, int):
+                        encoded = {"intValue": str(value)}
+                    elif isinstance(value, float):
+                        encoded = {"doubleValue": value}
+                    else:
+                        encoded = {"stringValue": str(value)}
+                    attributes.append({"key": key, "value": encoded})
+                spans.append({
+                    "traceId": span.trace_id,
+                    "spanId": span.span_id,
+                    "parentSpanId": span.parent_id or "",
+                    "name": span.name,
+                    "kind": 2 if span.parent_id is None else 1,
+                    "startTimeUnixNano": str(span.start_ns),
+                    "endTimeUnixNano": str(span.end_ns),
+                    "attributes": attributes
+                })
+            payload = {"resourceSpans": [{
+                "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": "example-mcp-server"}}]},
+                "scopeSpans": [{"scope": {"name": "example-mcp-server"}, "spans": spans}]
+            }]}
+            request = urllib.request.Request(
+                self.otlp_endpoint,
+                data=json.dumps(payload).encode("utf-8"),
+                headers={"Content-Type": "application/json"}
+            )
+            try:
+                urllib.request.urlopen(request, timeout=5).close()
+            except Exception as e:
+                logger.warning(f"OTLP trace export failed: {e}")
+
+
+tracer = Tracer(TRACE_FILE, TRACE_OTLP_ENDPOINT, TRACE_SAMPLE_RATES)
+
+
+class Profiler:
+    """On-demand cProfile or stack-sampling profiler with optional tracemalloc.
+
+    A session runs for a fixed duration or number of tool calls. Results are
+    written to PROFILE_DIR (pstats or collapsed stacks, plus a tracemalloc
+    snapshot) and summarized as top-N hot functions and allocation sites.
+    When no session is active the only cost is the ``active`` check per call.
+    """
+
+    def __init__(self, output_dir: str):
+        self.output_dir = output_dir
+        self.active = False
+        self.session: Dict[str, Any] = {}
+        self.last_report: Optional[Dict[str, Any]] = None
+        self._profile: Optional[cProfile.Profile] = None
+        self._stacks: collections.Counter = collections.Counter()
+        self._sampler: Optional[threading.Thread] = None
+        self._stop_sampling = threading.Event()
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    def start(self, mode: str, duration: Optional[float], calls: Optional[int], trace_memory: bool, top: int) -> Dict[str, Any]:
+        if self.active:
+            raise ValueError("A profiling session is already running")
+        if mode not in ("sampling", "cprofile"):
+            raise ValueError(f"Unknown profiling mode {mode}")
+        if not duration and not calls:
+            raise ValueError("duration or calls is required")
+
+        self.session = {
+            "mode": mode,
+            "startedAt": datetime.datetime.now().isoformat(),
+            "duration": duration,
+            "calls": calls,
+            "callsSeen": 0,
+            "traceMemory": trace_memory,
+            "top": top,
+            "start": time.perf_counter(),
+            "ownsTracemalloc": trace_memory and not tracemalloc.is_tracing()
+        }
+        if self.session["ownsTracemalloc"]:
+            tracemalloc.start(10)
+        if mode == "cprofile":
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        else:
+            self._stacks = collections.Counter()
+            self._stop_sampling.clear()
+            self._sampler = threading.Thread(
+                target=self._sample,
+                args=(threading.get_ident(),),
+                name="stack-sampler",
+                daemon=True
+            )
+            self._sampler.start()
+        if duration:
+            self._timer = asyncio.get_running_loop().call_later(duration, self.stop)
+        self.active = True
+        return self.status()
+
+    def _sample(self, thread_id: int, interval: float = 0.005):
+        while not self._stop_sampling.wait(interval):
+            frame = sys._current_frames().get(thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self._stacks[";".join(reversed(stack))] += 1
+
+    def after_call(self, tool: str):
+        """Count a finished tool call and stop once the session's call budget is used.
+
+        Calls to the profiling tool itself are not counted. Errors writing the
+        report are logged rather than raised, so the profiled call's result is
+        still returned.
+        """
+        if tool == "admin-profile":
+            return
+        self.session["callsSeen"] += 1
+        if self.session["calls"] and self.session["callsSeen"] >= self.session["calls"]:
+            try:
+                self.stop()
+            except Exception as e:
+                logger.error(f"Profiling session could not be saved: {e}")
+
+    def status(self) -> Dict[str, Any]:
+        if not self.active:
+            return {"active": False, "lastReport": self.last_report}
+        return {
+            "active": True,
+            **{key: value for key, value in self.session.items() if key not in ("start", "ownsTracemalloc")},
+            "elapsedSeconds": round(time.perf_counter() - self.session["start"], 3)
+        }
+
+    def stop(self) -> Dict[str, Any]:
+        """End the session, write output files and return the summary report."""
+        if not self.active:
+            raise ValueError("No profiling session is running")
+        self.active = False
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        # Stop collecting before writing anything, so a write error cannot leave profiling on
+        profile, self._profile = self._profile, None
+        if profile is not None:
+            profile.disable()
+        else:
+            self._stop_sampling.set()
+            self._sampler.join()
+            self._sampler = None
+        snapshot = None
+        if self.session["traceMemory"] and tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot()
+            if self.session["ownsTracemalloc"]:
+                tracemalloc.stop()
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        stamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+        top = self.session["top"]
+        report: Dict[str, Any] = {
+            "mode": self.session["mode"],
+            "startedAt": self.session["startedAt"],
+            "elapsedSeconds": round(time.perf_counter() - self.session["start"], 3),
+            "toolCalls": self.session["callsSeen"],
+            "files": []
+        }
+
+        if profile is not None:
+            path = os.path.join(self.output_dir, f"profile-{stamp}.prof")
+            profile.dump_stats(path)
+            report["files"].append(path)
+            stats = pstats.Stats(profile).stats
+            entries = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)
+
+            def describe(key, value):
+                filename, lineno, function = key
+                return {
+                    "function": f"{function} ({os.path.basename(filename)}:{lineno})",
+                    "calls": value[1],
+                    "selfMs": round(value[2] * 1000, 3),
+                    "cumulativeMs": round(value[3] * 1000, 3)
+                }
+
+            report["hotFunctions"] = [describe(key, value) for key, value in entries[:top]]
+            report["serverFunctions"] = [
+                describe(key, value) for key, value in entries
+                if key[0] == os.path.abspath(__file__)
+            ][:top]
+        else:
+            path = os.path.join(self.output_dir, f"profile-{stamp}.collapsed")
+            with open(path, "w", encoding="utf-8") as f:
+                for stack, count in self._stacks.most_common():
+                    f.write(f"{stack} {count}\n")
+            report["files"].append(path)
+            total = sum(self._stacks.values()) or 1
+            inclusive: collections.Counter = collections.Counter()
+            leaf: collections.Counter = collections.Counter()
+            for stack, count in self._stacks.items():
+                frames = stack.split(";")
+                for frame in set(frames):
+                    inclusive[frame] += count
+                leaf[frames[-1]] += count
+
+            def describe_sample(frame: str, count: int) -> Dict[str, Any]:
+                return {
+                    "function": frame,
+                    "samples": count,
+                    "selfPercent": round(100 * leaf[frame] / total, 2),
+                    "inclusivePercent": round(100 * inclusive[frame] / total, 2)
+                }
+
+            report["samples"] = sum(self._stacks.values())
+            report["hotFunctions"] = [describe_sample(frame, count) for frame, count in leaf.most_common(top)]
+            server_file = os.path.basename(__file__)
+            report["serverFunctions"] = [
+                describe_sample(frame, count) for frame, count in inclusive.most_common()
+                if f"({server_file}:" in frame
+            ][:top]
+
+        if snapshot is not None:
+            path = os.path.join(self.output_dir, f"profile-{stamp}.tracemalloc")
+            snapshot.dump(path)
+            report["files"].append(path)
+            report["topAllocations"] = [
+                {
+                    "location": f"{os.path.basename(stat.traceback[0].filename)}:{stat.traceback[0].lineno}",
+                    "sizeKB": round(stat.size / 1024, 1),
+                    "count": stat.count
+                }
+                for stat in snapshot.statistics("lineno")[:top]
+            ]
+
+        self.last_report = report
+        logger.info(f"Profiling session finished: {', '.join(report['files'])}")
+        return report
+
+
+profiler = Profiler(PROFILE_DIR)
+
+
+class TracingStdout:
+    """Wraps the stdio transport's stdout to time writing traced responses.
+
+    The transport writes each serialized message with ``write()`` followed by
+    ``flush()``; for responses to sampled tool calls, a ``write`` span covers
+    both. The request id is read from the start of the serialized message.
+    """
+
+    id_pattern = re.compile(r'"id":("(?:[^"\\]|\\.)*"|-?\d+)')
+
+    def __init__(self, stdout):
+        self._stdout = stdout
+        self._span: Optional[Span] = None
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._stdout, name)
+
+    async def write(self, text: str):
+        if tracer.pending_writes:
+            match = self.id_pattern.search(text, 0, 128)
+            root = tracer.pending_writes.pop(json.loads(match.group(1)), None) if match else None
+            if root is not None:
+                self._span = Span("write", root.trace_id, root.span_id, {
+                    "tool": root.attributes.get("tool"),
+                    "bytes": len(text)
+                })
+        return await self._stdout.write(text)
+
+    async def flush(self):
+        await self._stdout.flush()
+        if self._span is not None:
+            self._span.finish()
+            tracer.export(self._span)
+            self._span = None
+
+
+# MySQL cluster definitions for read-replica routing
+MYSQL_CLUSTERS_FILE = os.environ.get("MCP_MYSQL_CLUSTERS", os.path.join(SERVER_DIR, "mysql_clusters.json"))
+
+
+class MySQLCluster:
+    """Routes read-only queries across the replicas of a named MySQL cluster.
+
+    Replicas are chosen by weighted random order among healthy nodes. A node
+    that fails to connect is marked down for ``retryAfter`` seconds, replicas
+    lagging more than ``maxReplicationLag`` seconds are skipped, and the
+    primary is used as the last resort.
+    """
+
+    def __init__(self, name: str, config: Dict[str, Any]):
+        self.name = name
+        self.credentials = {
+            "user": config.get("user"),
+            "password": config.get("password"),
+            "database": config.get("database")
+        }
+        self.primary = config.get("primary")
+        self.replicas = [
+            {"port": 3306, "weight": 1, **replica}
+            for replica in config.get("replicas", [])
+        ]
+        self.max_lag = config.get("maxReplicationLag", 30)
+        self.health_check_interval = config.get("healthCheckInterval", 10)
+        self.retry_after = config.get("retryAfter", 30)
+        self.health: Dict[str, Dict[str, Any]] = {}
+
+    @staticmethod
+    def node_key(node: Dict[str, Any]) -> str:
+        return f"{node['host']}:{node.get('port', 3306)}"
+
+    def node_health(self, node: Dict[str, Any]) -> Dict[str, Any]:
+        return self.health.setdefault(self.node_key(node), {"downUntil": 0, "lag": None, "checkedAt": 0})
+
+    def candidates(self) -> List[Dict[str, Any]]:
+        """Return nodes to try in order: healthy replicas by weight, then the primary."""
+        now = time.monotonic()
+        healthy = []
+        for replica in self.replicas:
+            health = self.node_health(replica)
+            if health["downUntil"] > now:
+                continue
+            if health["lag"] is not None and health["lag"] > self.max_lag and now - health["checkedAt"] < self.health_check_interval:
+                continue
+            healthy.append(replica)
+        # Weighted random ordering (Efraimidis-Spirakis keys)
+        healthy.sort(key=lambda replica: random.random() ** (1.0 / max(replica["weight"], 1e-6)), reverse=True)
+        if self.primary:
+            healthy.append({"port": 3306, **self.primary, "role": "primary"})
+        return healthy
+
+    def replication_lag(self, connection) -> Optional[float]:
+        """Return the replica's lag in seconds, or None if it cannot be determined.
+
+        A replica whose IO or SQL thread is stopped reports a NULL lag; that is
+        returned as infinity so the replica is treated as unhealthy.
+        """
+        cursor = connection.cursor(dictionary=True)
+        try:
+            for statement, column in (("SHOW REPLICA STATUS", "Seconds_Behind_Source"),
+                                      ("SHOW SLAVE STATUS", "Seconds_Behind_Master")):
+                try:
+                    cursor.execute(statement)
+                    status = cursor.fetchone()
+                except MySQLError:
+                    continue
+                if status is None:
+                    return None
+                lag = status.get(column)
+                return math.inf if lag is None else lag
+            return None
+        finally:
+            cursor.close()
+
+    def connect(self):
+        """Connect to the best available node, failing over on connection errors."""
+        errors = []
+        for node in self.candidates():
+            health = self.node_health(node)
+            params = {**self.credentials, **{k: v for k, v in node.items() if k in ("user", "password", "database")}}
+            try:
+                connection = mysql.connector.connect(
+                    host=node["host"],
+                    port=node.get("port", 3306),
+                    connection_timeout=node.get("connectionTimeout", 10),
+                    **params
+                )
+            except MySQLError as e:
+                health["downUntil"] = time.monotonic() + self.retry_after
+                errors.append(f"{self.node_key(node)}: {e}")
+                logger.warning(f"MySQL cluster {self.name}: node {self.node_key(node)} unavailable: {e}")
+                continue
+
+            if node.get("role") != "primary" and time.monotonic() - health["checkedAt"] >= self.health_check_interval:
+                health["lag"] = self.replication_lag(connection)
+                health["checkedAt"] = time.monotonic()
+                if health["lag"] == math.inf:
+                    health["downUntil"] = time.monotonic() + self.retry_after
+                    errors.append(f"{self.node_key(node)}: replication stopped")
+                    logger.warning(f"MySQL cluster {self.name}: replica {self.node_key(node)} is not replicating")
+                    connection.close()
+                    continue
+                if health["lag"] is not None and health["lag"] > self.max_lag:
+                    logger.warning(f"MySQL cluster {self.name}: replica {self.node_key(node)} lagging {health['lag']}s")
+                    connection.close()
+                    continue
+
+            health["downUntil"] = 0
+            return connection, node
+
+        raise MySQLError(msg=f"No available nodes in cluster {self.name}: {'; '.join(errors) or 'all replicas lagging'}")
+
+
+mysql_clusters: Optional[Dict[str, MySQLCluster]] = None
+
+
+def get_mysql_cluster(name: str) -> MySQLCluster:
+    """Look up a named cluster, loading the cluster definitions on first use."""
+    global mysql_clusters
+    if mysql_clusters is None:
+        config = {}
+        if os.path.exists(MYSQL_CLUSTERS_FILE):
+            with open(MYSQL_CLUSTERS_FILE, "r", encoding="utf-8") as f:
+                config = json.load(f).get("clusters", {})
+        mysql_clusters = {
+            cluster_name: MySQLCluster(cluster_name, cluster_config)
+            for cluster_name, cluster_config in config.items()
+        }
+    if name not in mysql_clusters:
+        raise ValueError(f"Unknown MySQL cluster {name}")
+    return mysql_clusters[name]
+
+
+# Named in-memory SQLite workspaces, alive for the lifetime of the server session
+sqlite_workspaces: Dict[str, sqlite3.Connection] = {}
+
+IDENTIFIER_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def create_workspace(name: str) -> sqlite3.Connection:
+    """Create a named shared-cache in-memory database and keep it open."""
+    if not IDENTIFIER_PATTERN.match(name):
+        raise ValueError(f"Invalid workspace name {name}")
+    if name in sqlite_workspaces:
+        raise ValueError(f"Workspace {name} already exists")
+    conn = sqlite3.connect(f"file:workspace_{name}?mode=memory&cache=shared", uri=True)
+    conn.row_factory = sqlite3.Row
+    sqlite_workspaces[name] = conn
+    return conn
+
+
+def get_workspace(name: str) -> sqlite3.Connection:
+    """Return the connection holding a named workspace."""
+    if name not in sqlite_workspaces:
+        raise ValueError(f"Workspace {name} does not exist")
+    return sqlite_workspaces[name]
+
+
+def drop_workspace(name: str) -> bool:
+    """Close a workspace, releasing its memory. Returns False if it did not exist."""
+    conn = sqlite_workspaces.pop(name, None)
+    if conn is None:
+        return False
+    conn.close()
+    return True
+
+
+def rollback_workspace(workspace: Optional[str]):
+    """Roll back a transaction a failed statement left open on a workspace connection.
+
+    Workspace connections stay open between calls, so an implicit transaction
+    left behind by an error would otherwise block later writes and backups.
+    """
+    conn = sqlite_workspaces.get(workspace) if workspace else None
+    if conn is not None and conn.in_transaction:
+        conn.rollback()
+
+
+def sqlite_connect(db_path: str, workspace: Optional[str] = None) -> sqlite3.Connection:
+    """Open a database file, or return the connection of a named workspace."""
+    if workspace:
+        return get_workspace(workspace)
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def create_fts_index(conn: sqlite3.Connection, table: str, columns: List[str]) -> str:
+    """Create an external-content FTS5 index over ``columns`` of ``table``.
+
+    Triggers keep the index in sync with inserts, updates and deletes on the
+    source table. Returns the name of the FTS5 table.
+    """
+    for identifier in [table] + columns:
+        if not IDENTIFIER_PATTERN.match(identifier):
+            raise ValueError(f"Invalid identifier {identifier}")
+    existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+    if not existing:
+        raise ValueError(f"Table {table} does not exist")
+    missing = [column for column in columns if column not in existing]
+    if missing:
+        raise ValueError(f"Unknown columns for {table}: {', '.join(missing)}")
+
+    fts = f"{table}_fts"
+    column_list = ", ".join(columns)
+    new_values = ", ".join(f"new.{column}" for column in columns)
+    old_values = ", ".join(f"old.{column}" for column in columns)
+    drop_fts_index(conn, table)
+    conn.executescript(f"""
+        CREATE VIRTUAL TABLE {fts} USING fts5({column_list}, content='{table}', content_rowid='rowid');
+        CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN
+            INSERT INTO {fts}(rowid, {column_list}) VALUES (new.rowid, {new_values});
+        END;
+        CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN
+            INSERT INTO {fts}({fts}, rowid, {column_list}) VALUES ('delete', old.rowid, {old_values});
+        END;
+        CREATE TRIGGER {fts}_au AFTER UPDATE ON {table} BEGIN
+            INSERT INTO {fts}({fts}, rowid, {column_list}) VALUES ('delete', old.rowid, {old_values});
+            INSERT INTO {fts}(rowid, {column_list}) VALUES (new.rowid, {new_values});
+        END;
+        INSERT INTO {fts}({fts}) VALUES ('rebuild');
+    """)
+    return fts
+
+
+def drop_fts_index(conn: sqlite3.Connection, table: str):
+    """Drop the FTS5 index and sync triggers for ``table`` if they exist."""
+    if not IDENTIFIER_PATTERN.match(table):
+        raise ValueError(f"Invalid identifier {table}")
+    fts = f"{table}_fts"
+    conn.executescript(f"""
+        DROP TRIGGER IF EXISTS {fts}_ai;
+        DROP TRIGGER IF EXISTS {fts}_ad;
+        DROP TRIGGER IF EXISTS {fts}_au;
+        DROP TABLE IF EXISTS {fts};
+    """)
+
+
+# Tool response encoding: pretty (indented) or compact JSON
+JSON_PRETTY = os.environ.get("MCP_JSON_PRETTY", "1").lower() not in ("0", "false", "no")
+
+# Optional process pool for CPU-heavy stages (disabled when 0 workers)
+PROCESS_POOL_WORKERS = int(os.environ.get("MCP_PROCESS_POOL_WORKERS", "0"))
+PROCESS_POOL_MIN_BYTES = int(os.environ.get("MCP_PROCESS_POOL_MIN_BYTES", str(1024 * 1024)))
+PROCESS_POOL_MIN_ITEMS = int(os.environ.get("MCP_PROCESS_POOL_MIN_ITEMS", "1000"))
+
+# Response size guardrails (bytes)
+MAX_RESPONSE_BYTES = int(os.environ.get("MCP_MAX_RESPONSE_BYTES", str(8 * 1024 * 1024)))
+MAX_VALUE_BYTES = int(os.environ.get("MCP_MAX_VALUE_BYTES", str(64 * 1024)))
+MAX_INFLIGHT_BYTES = int(os.environ.get("MCP_MAX_INFLIGHT_BYTES", str(64 * 1024 * 1024)))
+FETCH_BATCH_SIZE = 100
+
+# Index advisor configuration
+INDEX_ADVISOR_INTERVAL = float(os.environ.get("MCP_INDEX_ADVISOR_INTERVAL", "300"))
+INDEX_ADVISOR_AUTO_APPLY = os.environ.get("MCP_INDEX_ADVISOR_AUTO_APPLY", "").lower() in ("1", "true", "yes")
+
+SQL_KEYWORDS = {
+    "where", "join", "inner", "left", "right", "full", "outer", "cross", "natural",
+    "on", "using", "group", "order", "limit", "having", "union", "except", "intersect", "window"
+}
+
+
+def normalize_sql(query: str) -> str:
+    """Replace literals and collapse whitespace so similar statements share a key."""
+    normalized = re.sub(r"'(?:[^']|'')*'", "?", query)
+    normalized = re.sub(r"\b\d+(?:\.\d+)?\b", "?", normalized)
+    return re.sub(r"\s+", " ", normalized).strip().lower()
+
+
+def table_aliases(query: str) -> Dict[str, str]:
+    """Map table names and aliases in FROM/JOIN clauses to table names."""
+    aliases = {}
+    for table, alias in re.findall(r"\b(?:from|join)\s+(\w+)(?:\s+(?:as\s+)?(\w+))?", query, re.IGNORECASE):
+        aliases[table] = table
+        if alias and alias.lower() not in SQL_KEYWORDS:
+            aliases[alias] = table
+    return aliases
+
+
+def propose_index_columns(query: str, reference: str, columns: List[str], qualified: bool) -> List[str]:
+    """Choose index columns for a scanned table from the predicates in ``query``.
+
+    Equality columns come first, then join columns, then one range column,
+    then ORDER BY columns. Other referenced columns are appended to make the
+    index covering when the result stays small.
+    """
+    prefix = rf"\b{reference}\." if qualified else rf"(?:\b{reference}\.)?"
+    order_clause = re.search(r"\border\s+by\s+(.*?)(?:\blimit\b|$)", query, re.IGNORECASE | re.DOTALL)
+    equality, joins, ranges, ordering, referenced = [], [], [], [], []
+    for column in columns:
+        pattern = rf"{prefix}\b{column}\b"
+        if not re.search(pattern, query, re.IGNORECASE):
+            continue
+        referenced.append(column)
+        if (re.search(pattern + r"\s*==?\s*\w+\.\w+", query, re.IGNORECASE)
+                or re.search(r"\w+\.\w+\s*(?<![<>!])==?\s*" + pattern, query, re.IGNORECASE)):
+            joins.append(column)
+        elif (re.search(pattern + r"\s*(?:==?|\bin\b|\bis\b)", query, re.IGNORECASE)
+                or re.search(r"(?<![<>!])==?\s*" + pattern, query, re.IGNORECASE)):
+            equality.append(column)
+        elif (re.search(pattern + r"\s*(?:[<>]|\bbetween\b)", query, re.IGNORECASE)
+                or re.search(r"[<>]=?\s*" + pattern, query, re.IGNORECASE)):
+            ranges.append(column)
+        elif order_clause and re.search(pattern, order_clause.group(1), re.IGNORECASE):
+            ordering.append(column)
+
+    proposal = equality + joins + ranges[:1] + ordering
+    if not proposal:
+        return []
+    extra = [column for column in referenced if column not in proposal]
+    selects_all = re.search(rf"(?:select|,)\s*(?:{reference}\.)?\*", query, re.IGNORECASE)
+    if extra and not selects_all and len(proposal) + len(extra) <= 5:
+        proposal += extra
+    return proposal
+
+
+class IndexAdvisor:
+    """Records the sqlite-query workload and proposes indexes for full scans.
+
+    The most frequent and the slowest statements are periodically run through
+    ``EXPLAIN QUERY PLAN``; tables reached by a full ``SCAN`` get an index
+    proposal built from the statement's predicates. Proposals are only created
+    automatically when ``auto_apply`` is enabled.
+    """
+
+    max_statements = 500
+    top_statements = 10
+    # Bounds on timing a sample query in apply(), which runs on the event loop
+    sample_timeout = 0.5
+    sample_rows = 10000
+
+    def __init__(self, interval: float, auto_apply: bool):
+        self.interval = interval
+        self.auto_apply = auto_apply
+        self.workload: Dict[Tuple[Optional[str], Optional[str], str], Dict[str, Any]] = {}
+        self.recommendations: List[Dict[str, Any]] = []
+        self.analyzed_at: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def record(self, db_path: str, workspace: Optional[str], query: str, elapsed: float):
+        """Record one execution of a SELECT statement."""
+        key = (None if workspace else db_path, workspace, normalize_sql(query))
+        stats = self.workload.get(key)
+        if stats is None:
+            if len(self.workload) >= self.max_statements:
+                del self.workload[min(self.workload, key=lambda k: self.workload[k]["count"])]
+            stats = self.workload[key] = {"count": 0, "totalTime": 0.0, "maxTime": 0.0}
+        stats["count"] += 1
+        stats["totalTime"] += elapsed
+        stats["maxTime"] = max(stats["maxTime"], elapsed)
+        stats["sample"] = query
+
+    def hot_statements(self) -> List[Tuple[Tuple[Optional[str], Optional[str], str], Dict[str, Any]]]:
+        """Return the most frequent and the slowest recorded statements."""
+        items = list(self.workload.items())
+        by_count = sorted(items, key=lambda item: item[1]["count"], reverse=True)[:self.top_statements]
+        by_time = sorted(items, key=lambda item: item[1]["totalTime"], reverse=True)[:self.top_statements]
+        return list(dict(by_count + by_time).items())
+
+    @staticmethod
+    def leading_columns(conn: sqlite3.Connection, table: str) -> set:
+        """Return the leading column of every existing index on ``table``."""
+        columns = set()
+        for index in conn.execute(f"PRAGMA index_list({table})").fetchall():
+            leading = conn.execute(f"PRAGMA index_info({index[1]})").fetchall()
+            if leading:
+                columns.add(leading[0][2])
+        return columns
+
+    def time_sample(self, conn: sqlite3.Connection, query: str) -> Optional[float]:
+        """Time ``query``, or return None if it runs longer than ``sample_timeout``.
+
+        At most ``sample_rows`` rows are fetched.
+        """
+        deadline = time.perf_counter() + self.sample_timeout
+        conn.set_progress_handler(lambda: time.perf_counter() > deadline, 1000)
+        start = time.perf_counter()
+        cursor = conn.cursor()
+        try:
+            cursor.execute(query).fetchmany(self.sample_rows)
+        except sqlite3.OperationalError as e:
+            if "interrupted" not in str(e):
+                raise
+            return None
+        finally:
+            cursor.close()
+            conn.set_progress_handler(None, 0)
+        return time.perf_counter() - start
+
+    def explain(self, conn: sqlite3.Connection, query: str) -> List[Dict[str, Any]]:
+        """Return index proposals for the full table scans in ``query``'s plan."""
+        aliases = table_aliases(query)
+        qualified = len(set(aliases.values())) > 1
+        proposals = []
+        for row in conn.execute(f"EXPLAIN QUERY PLAN {query}").fetchall():
+            detail = row[3]
+            match = re.match(r"SCAN (?:TABLE )?(\w+)(?: AS (\w+))?$", detail)
+            if not match:
+                continue
+            table = aliases.get(match.group(1), match.group(1))
+            reference = match.group(2) or match.group(1)
+            table_info = conn.execute(f"PRAGMA table_info({table})").fetchall()
+            if not table_info:
+                continue
+            columns = propose_index_columns(query, reference, [info[1] for info in table_info], qualified)
+            rowid_alias = [info[1] for info in table_info if info[5] == 1 and info[2].upper() == "INTEGER"]
+            if not columns or columns[0] in rowid_alias:
+                continue
+            if columns[0] in self.leading_columns(conn, table):
+                continue
+            index_name = f"idx_{table}_{'_'.join(columns)}"[:60]
+            proposals.append({
+                "table": table,
+                "columns": columns,
+                "index": index_name,
+                "sql": f"CREATE INDEX IF NOT EXISTS {index_name} ON {table} ({', '.join(columns)})",
+                "plan": detail
+            })
+        return proposals
+
+    def analyze(self) -> List[Dict[str, Any]]:
+        """Explain the hot statements and refresh the index recommendations."""
+        recommendations: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+        for (db_path, workspace, _), stats in self.hot_statements():
+            if workspace is None and not os.path.exists(db_path):
+                continue
+            try:
+                conn = sqlite_connect(db_path, workspace)
+            except ValueError:
+                continue  # workspace was dropped
+            try:
+                for proposal in self.explain(conn, stats["sample"]):
+                    key = (db_path, workspace, proposal["index"])
+                    if key not in recommendations:
+                        recommendations[key] = {
+                            **proposal,
+                            "database": os.path.relpath(db_path, SERVER_DIR) if db_path else None,
+                            "workspace": workspace,
+                            "executions": 0,
+                            "totalTimeMs": 0.0,
+                            "sample": stats["sample"]
+                        }
+                    recommendations[key]["executions"] += stats["count"]
+                    recommendations[key]["totalTimeMs"] += round(stats["totalTime"] * 1000, 3)
+            except sqlite3.Error as e:
+                logger.debug(f"Index advisor could not explain query: {e}")
+            finally:
+                if not workspace:
+                    conn.close()
+
+        # One index per leading column: proposals sharing it overlap, keep the costliest
+        leading: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+        for rec in sorted(recommendations.values(), key=lambda rec: rec["totalTimeMs"], reverse=True):
+            key = (rec["database"], rec["workspace"], rec["table"], rec["columns"][0])
+            if key in leading:
+                leading[key]["executions"] += rec["executions"]
+                leading[key]["totalTimeMs"] += rec["totalTimeMs"]
+            else:
+                leading[key] = rec
+        self.recommendations = sorted(leading.values(), key=lambda rec: rec["totalTimeMs"], reverse=True)
+        self.analyzed_at = datetime.datetime.now().isoformat()
+        return self.recommendations
+
+    def apply(self, index_names: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Create recommended indexes, timing each sample query before and after.
+
+        Proposals whose leading column gained an index since the last analysis
+        are skipped. Sample timings are bounded by ``time_sample`` and reported
+        as None when the query exceeded the timeout. An index the sample's new
+        plan does not use is dropped again and left out of the result.
+        """
+        applied = []
+        done = set()
+        for rec in self.recommendations:
+            if index_names and rec["index"] not in index_names:
+                continue
+            db_path = os.path.join(SERVER_DIR, rec["database"]) if rec["database"] else None
+            conn = sqlite_connect(db_path, rec["workspace"])
+            try:
+                done.add(rec["index"])
+                if rec["columns"][0] in self.leading_columns(conn, rec["table"]):
+                    continue
+                before = self.time_sample(conn, rec["sample"])
+                conn.execute(rec["sql"])
+                conn.commit()
+                after = self.time_sample(conn, rec["sample"])
+                plan = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {rec['sample']}")]
+                if not any(re.search(rf"\bINDEX {rec['index']}\b", detail) for detail in plan):
+                    conn.execute(f"DROP INDEX {rec['index']}")
+                    conn.commit()
+                    logger.info(f"Index advisor dropped {rec['index']}: not used by the sample query")
+                    continue
+                applied.append({
+                    "index": rec["index"],
+                    "sql": rec["sql"],
+                    "database": rec["database"],
+                    "workspace": rec["workspace"],
+                    "beforeMs": round(before * 1000, 3) if before is not None else None,
+                    "afterMs": round(after * 1000, 3) if after is not None else None,
+                    "plan": plan
+                })
+            finally:
+                if not rec["workspace"]:
+                    conn.close()
+        self.recommendations = [rec for rec in self.recommendations if rec["index"] not in done]
+        return applied
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                # Runs on the event loop thread: workspace connections are bound to it
+                if self.workload and self.analyze() and self.auto_apply:
+                    for item in self.apply():
+                        logger.info(f"Index advisor created {item['index']}: {item['beforeMs']}ms -> {item['afterMs']}ms")
+            except Exception as e:
+                logger.warning(f"Index advisor error: {e}")
+
+    def start(self):
+        """Start periodic analysis on the running event loop."""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Cancel periodic analysis."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+index_advisor = IndexAdvisor(INDEX_ADVISOR_INTERVAL, INDEX_ADVISOR_AUTO_APPLY)
+
+
+def json_default(value: Any) -> Any:
+    """Encode values the JSON encoders do not support natively."""
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return base64.b64encode(bytes(value)).decode("ascii")
+    if isinstance(value, sqlite3.Row):
+        return dict(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    return str(value)
+
+
+def dump_json(value: Any, pretty: Optional[bool] = None) -> str:
+    """Serialize a tool response, using orjson when it is installed.
+
+    ``pretty`` defaults to the MCP_JSON_PRETTY setting; compact output drops
+    indentation and separator whitespace.
+    """
+    if pretty is None:
+        pretty = JSON_PRETTY
+    if orjson is not None:
+        try:
+            options = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+            return orjson.dumps(value, default=json_default, option=options).decode("utf-8")
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits; the stdlib encoder handles them
+    if pretty:
+        return json.dumps(value, indent=2, default=json_default)
+    return json.dumps(value, separators=(",", ":"), default=json_default)
+
+
+def generate_user(id: int) -> Dict[str, Any]:
+    return {
+        "id": id,
+        "name": f"User {id}",
+        "email": f"user{id}@example.com",
+        "age": random.randint(18, 67),
+        "country": random.choice(["US", "UK", "CA", "AU", "DE"])
+    }
+
+
+def generate_product(id: int) -> Dict[str, Any]:
+    return {
+        "id": id,
+        "name": f"Product {id}",
+        "price": round(random.uniform(1, 100), 2),
+        "category": random.choice(["Electronics", "Clothing", "Books", "Home", "Sports"]),
+        "inStock": random.random() > 0.2
+    }
+
+
+def generate_order(id: int) -> Dict[str, Any]:
+    return {
+        "id": id,
+        "userId": random.randint(1, 100),
+        "productId": random.randint(1, 50),
+        "quantity": random.randint(1, 5),
+        "total": round(random.uniform(10, 500), 2),
+        "status": random.choice(["pending", "confirmed", "shipped", "delivered"])
+    }
+
+
+DATA_GENERATORS = {
+    "user": generate_user,
+    "product": generate_product,
+    "order": generate_order
+}
+
+
+def generate_records(data_type: str, count: int) -> List[Dict[str, Any]]:
+    """Generate ``count`` mock records of the given type."""
+    generator = DATA_GENERATORS[data_type]
+    return [generator(i + 1) for i in range(count)]
+
+
+process_pool: Optional[concurrent.futures.ProcessPoolExecutor] = None
+
+
+def get_process_pool() -> Optional[concurrent.futures.ProcessPoolExecutor]:
+    """Return the shared process pool, creating it on first use if enabled."""
+    global process_pool
+    if process_pool is None and PROCESS_POOL_WORKERS > 0:
+        # Spawn rather than fork: the server process already runs background threads
+        process_pool = concurrent.futures.ProcessPoolExecutor(
+            max_workers=PROCESS_POOL_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return process_pool
+
+
+def write_shared_text(text: str) -> Tuple[str, int]:
+    """Copy encoded text into a new shared memory block; returns its name and size."""
+    data = text.encode("utf-8")
+    block = shared_memory.SharedMemory(create=True, size=max(len(data), 1))
+    block.buf[:len(data)] = data
+    name = block.name
+    # Spawned workers share the server's resource tracker, so the reader's
+    # unlink() balances the registration made here
+    block.close()
+    return name, len(data)
+
+
+def read_shared_text(name: str, size: int) -> str:
+    """Decode text straight from a shared memory block, then release the block."""
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        with block.buf[:size] as view:
+            return str(view, "utf-8")
+    finally:
+        block.close()
+        block.unlink()
+
+
+def encode_in_worker(value: Any, pretty: bool) -> Tuple[str, int]:
+    return write_shared_text(dump_json(value, pretty))
+
+
+def generate_in_worker(data_type: str, count: int, pretty: bool) -> Tuple[str, int]:
+    return write_shared_text(dump_json(generate_records(data_type, count), pretty))
+
+
+async def offload(func, *args) -> str:
+    """Run a worker function that returns its output through shared memory."""
+    loop = asyncio.get_running_loop()
+    name, size = await loop.run_in_executor(get_process_pool(), func, *args)
+    return read_shared_text(name, size)
+
+
+async def encode_response(value: Any, size_hint: int) -> str:
+    """Serialize a response, in the process pool when it is enabled and the value is large.
+
+    The value has to be pickled to reach a worker. That costs about as much as
+    encoding it with orjson, so large values are only offloaded when the server
+    falls back to the stdlib encoder.
+    """
+    if size_hint < PROCESS_POOL_MIN_BYTES or orjson is not None or get_process_pool() is None:
+        return dump_json(value)
+    return await offload(encode_in_worker, value, JSON_PRETTY)
+
+
+class ResponseBudget:
+    """Server-wide byte budget shared by the query results of in-flight calls.
+
+    Rows are fetched synchronously, so results only overlap while they are
+    serialized and written; each call holds its result size for that span and
+    later calls fetch within what is left.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_use = 0
+
+    def available(self) -> int:
+        return max(self.limit - self.in_use, 0)
+
+    @contextlib.contextmanager
+    def hold(self, size: int):
+        self.in_use += size
+        try:
+            yield
+        finally:
+            self.in_use -= size
+
+
+response_budget = ResponseBudget(MAX_INFLIGHT_BYTES)
+
+
+def cap_value(value: Any) -> Any:
+    """Truncate or summarize a single column value larger than MAX_VALUE_BYTES."""
+    # A character encodes to at most 4 UTF-8 bytes, so short strings skip encoding
+    if isinstance(value, str) and len(value) * 4 > MAX_VALUE_BYTES:
+        encoded = value.encode("utf-8")
+        if len(encoded) > MAX_VALUE_BYTES:
+            kept = encoded[:MAX_VALUE_BYTES].decode("utf-8", errors="ignore")
+            return f"{kept}... [truncated {len(encoded) - len(kept.encode('utf-8'))} bytes]"
+    if isinstance(value, (bytes, bytearray)) and len(value) > MAX_VALUE_BYTES:
+        return f"<binary {len(value)} bytes, truncated>"
+    return value
+
+
+def estimate_size(row: Dict[str, Any]) -> int:
+    """Cheaply estimate the JSON-encoded size of a result row in bytes."""
+    size = 2
+    for key, value in row.items():
+        size += len(key) + 8
+        if isinstance(value, str):
+            size += len(value) + 2
+        elif isinstance(value, (bytes, bytearray)):
+            size += (len(value) + 2) // 3 * 4 + 2  # base64-encoded
+        else:
+            size += len(str(value))
+    return size
+
+
+def fetch_within_budget(cursor, max_bytes: int) -> Tuple[List[Dict[str, Any]], int, bool]:
+    """Fetch rows incrementally until the cursor is exhausted or the budget is used.
+
+    The budget is ``max_bytes`` or what is left of the server-wide
+    ``response_budget``, whichever is smaller. Returns the rows, their
+    estimated encoded size and whether the result was cut short. At least one
+    row is always returned so continuation makes progress.
+    """
+    max_bytes = min(max_bytes, response_budget.available())
+    rows = []
+    used = 0
+    while True:
+        batch = cursor.fetchmany(FETCH_BATCH_SIZE)
+        if not batch:
+            return rows, used, False
+        for row in batch:
+            record = {key: cap_value(value) for key, value in dict(row).items()}
+            size = estimate_size(record)
+            if rows and used + size > max_bytes:
+                return rows, used, True
+            rows.append(record)
+            used += size
+
+
+def make_continuation(query: str, offset: int) -> str:
+    """Encode a token that resumes ``query`` at row ``offset``."""
+    payload = {"q": hashlib.sha1(query.encode("utf-8")).hexdigest()[:16], "o": offset}
+    return base64.urlsafe_b64encode(json.dumps(payload).encode("utf-8")).decode("ascii")
+
+
+def parse_continuation(token: str, query: str) -> int:
+    """Decode a continuation token for ``query`` and return its row offset."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token.encode("ascii")))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid continuation token")
+    if payload.get("q") != hashlib.sha1(query.encode("utf-8")).hexdigest()[:16]:
+        raise ValueError("Continuation token does not match this query")
+    return int(payload["o"])
+
+
+def continuation_query(query: str, offset: int) -> str:
+    """Wrap ``query`` so that it skips the first ``offset`` rows."""
+    return f"SELECT * FROM ({query.rstrip().rstrip(';')}) AS continuation LIMIT 9223372036854775807 OFFSET {offset}"
+
+
+AGGREGATE_FUNCTIONS = ("count", "sum", "avg")
+
+
+def aggregate_definition(name: str, table: str, group_by: List[str], aggregates: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Validate and normalize an aggregate view definition."""
+    for identifier in [name, table] + group_by:
+        if not IDENTIFIER_PATTERN.match(identifier or ""):
+            raise ValueError(f"Invalid identifier {identifier}")
+    normalized = []
+    for aggregate in aggregates:
+        function = str(aggregate.get("function", "")).lower()
+        column = aggregate.get("column")
+        if function not in AGGREGATE_FUNCTIONS:
+            raise ValueError(f"Unsupported aggregate function {function}; use one of {', '.join(AGGREGATE_FUNCTIONS)}")
+        if function != "count" and not column:
+            raise ValueError(f"Aggregate {function} requires a column")
+        if column and not IDENTIFIER_PATTERN.match(column):
+            raise ValueError(f"Invalid identifier {column}")
+        alias = aggregate.get("as") or (f"{function}_{column}" if column else function)
+        if not IDENTIFIER_PATTERN.match(alias):
+            raise ValueError(f"Invalid identifier {alias}")
+        normalized.append({"function": function, "column": column, "as": alias})
+    if not normalized:
+        raise ValueError("At least one aggregate is required")
+    return {"name": name, "table": table, "groupBy": group_by, "aggregates": normalized}
+
+
+def aggregate_columns(definition: Dict[str, Any]) -> List[str]:
+    """Return the source columns whose running sums and counts are kept."""
+    columns = []
+    for aggregate in definition["aggregates"]:
+        if aggregate["column"] and aggregate["column"] not in columns:
+            columns.append(aggregate["column"])
+    return columns
+
+
+def aggregate_select(definition: Dict[str, Any]) -> str:
+    """Build the query that serves an aggregate view from its summary table."""
+    outputs = list(definition["groupBy"])
+    for aggregate in definition["aggregates"]:
+        column = aggregate["column"]
+        if aggregate["function"] == "count":
+            expression = f"_n_{column}" if column else "_count"
+        elif aggregate["function"] == "sum":
+            expression = f"CASE WHEN _n_{column} > 0 THEN _sum_{column} + _err_{column} END"
+        else:
+            expression = f"CASE WHEN _n_{column} > 0 THEN (_sum_{column} + _err_{column}) * 1.0 / _n_{column} END"
+        outputs.append(f"{expression} AS {aggregate['as']}")
+    query = f"SELECT {', '.join(outputs)} FROM agg_{definition['name']}"
+    if definition["groupBy"]:
+        query += f" ORDER BY {', '.join(definition['groupBy'])}"
+    return query
+
+
+def refresh_aggregate(conn: sqlite3.Connection, definition: Dict[str, Any]):
+    """Recompute an aggregate view's summary table from its source table."""
+    group_by = definition["groupBy"]
+    columns = aggregate_columns(definition)
+    targets = group_by + ["_count"] + [f"_n_{c}" for c in columns] + [f"_sum_{c}" for c in columns]
+    sources = group_by + ["COUNT(*)"] + [f"COUNT({c})" for c in columns] + [f"COALESCE(SUM({c}), 0)" for c in columns]
+    query = f"INSERT INTO agg_{definition['name']} ({', '.join(targets)}) SELECT {', '.join(sources)} FROM {definition['table']}"
+    if group_by:
+        query += f" GROUP BY {', '.join(group_by)}"
+    conn.execute(f"DELETE FROM agg_{definition['name']}")
+    conn.execute(query)
+
+
+def create_aggregate(conn: sqlite3.Connection, definition: Dict[str, Any]):
+    """Create an aggregate view: summary table, maintenance triggers and metadata.
+
+    The summary table keeps COUNT(*) plus a running count and sum for every
+    aggregated column, so inserts, deletes and updates on the source table
+    adjust a single group row instead of rescanning the table. Sums are
+    compensated (Neumaier): ``_err_<column>`` collects the rounding error of
+    every step, so REAL sums do not drift as rows come and go.
+    """
+    name = definition["name"]
+    table = definition["table"]
+    group_by = definition["groupBy"]
+    columns = aggregate_columns(definition)
+
+    existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+    if not existing:
+        raise ValueError(f"Table {table} does not exist")
+    missing = [column for column in group_by + columns if column not in existing]
+    if missing:
+        raise ValueError(f"Unknown columns for {table}: {', '.join(missing)}")
+
+    summary = f"agg_{name}"
+    definitions = group_by + ["_count INTEGER NOT NULL DEFAULT 0"]
+    definitions += [f"_n_{c} INTEGER NOT NULL DEFAULT 0" for c in columns]
+    definitions += [f"_sum_{c} NUMERIC NOT NULL DEFAULT 0" for c in columns]
+    definitions += [f"_err_{c} NUMERIC NOT NULL DEFAULT 0" for c in columns]
+
+    def match(row: str) -> str:
+        return " AND ".join(f"{g} IS {row}.{g}" for g in group_by) or "1"
+
+    def apply(row: str, sign: str) -> str:
+        updates = [f"_count = _count {sign} 1"]
+        updates += [f"_n_{c} = _n_{c} {sign} ({row}.{c} IS NOT NULL)" for c in columns]
+        for c in columns:
+            value = f"({sign}COALESCE({row}.{c}, 0))"
+            total = f"(_sum_{c} + {value})"
+            # The right-hand sides see the old _sum, so this is one Neumaier step
+            updates += [
+                f"_sum_{c} = {total}",
+                f"_err_{c} = _err_{c} + CASE WHEN abs(_sum_{c}) >= abs({value}) "
+                f"THEN (_sum_{c} - {total}) + {value} ELSE ({value} - {total}) + _sum_{c} END"
+            ]
+        return f"UPDATE {summary} SET {', '.join(updates)} WHERE {match(row)};"
+
+    group_values = ", ".join(f"new.{g}" for g in group_by)
+    add_new = (
+        (f"INSERT INTO {summary} ({', '.join(group_by)}) SELECT {group_values} "
+         f"WHERE NOT EXISTS (SELECT 1 FROM {summary} WHERE {match('new')});" if group_by else
+         f"INSERT INTO {summary} (_count) SELECT 0 WHERE NOT EXISTS (SELECT 1 FROM {summary});")
+        + apply("new", "+")
+    )
+    remove_old = apply("old", "-") + f"DELETE FROM {summary} WHERE _count <= 0 AND {match('old')};"
+
+    drop_aggregate(conn, name)
+    conn.executescript(f"""
+        CREATE TABLE IF NOT EXISTS _mcp_aggregates (name TEXT PRIMARY KEY, definition TEXT NOT NULL);
+        CREATE TABLE {summary} ({', '.join(definitions)});
+        {f"CREATE INDEX {summary}_groups ON {summary} ({', '.join(group_by)});" if group_by else ""}
+        CREATE TRIGGER {summary}_ai AFTER INSERT ON {table} BEGIN {add_new} END;
+        CREATE TRIGGER {summary}_ad AFTER DELETE ON {table} BEGIN {remove_old} END;
+        CREATE TRIGGER {summary}_au AFTER UPDATE ON {table} BEGIN {remove_old} {add_new} END;
+    """)
+    refresh_aggregate(conn, definition)
+    conn.execute("INSERT INTO _mcp_aggregates (name, definition) VALUES (?, ?)", (name, json.dumps(definition)))
+    conn.commit()
+
+
+def drop_aggregate(conn: sqlite3.Connection, name: str):
+    """Drop an aggregate view's summary table, triggers and metadata if present."""
+    if not IDENTIFIER_PATTERN.match(name):
+        raise ValueError(f"Invalid identifier {name}")
+    summary = f"agg_{name}"
+    conn.executescript(f"""
+        DROP TRIGGER IF EXISTS {summary}_ai;
+        DROP TRIGGER IF EXISTS {summary}_ad;
+        DROP TRIGGER IF EXISTS {summary}_au;
+        DROP TABLE IF EXISTS {summary};
+    """)
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = '_mcp_aggregates'").fetchone():
+        conn.execute("DELETE FROM _mcp_aggregates WHERE name = ?", (name,))
+        conn.commit()
+
+
+def load_aggregate(conn: sqlite3.Connection, name: str) -> Dict[str, Any]:
+    """Load a registered aggregate view definition."""
+    row = None
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = '_mcp_aggregates'").fetchone():
+        row = conn.execute("SELECT definition FROM _mcp_aggregates WHERE name = ?", (name,)).fetchone()
+    if row is None:
+        raise ValueError(f"Aggregate view {name} does not exist")
+    return json.loads(row[0])
+
+
+# Last watermark seen per (data source, cursor name) for incremental "changes" queries
+change_cursors: Dict[Tuple[str, str], Any] = {}
+
+
+def changes_query(table: str, column: str, key_column: str, since: Any, limit: int,
+                  placeholder: str, quote: str) -> Tuple[str, tuple]:
+    """Build a query for rows of ``table`` whose ``column`` is past ``since``.
+
+    Unless ``column`` is the unique ``key_column`` itself, the watermark is the
+    pair ``[column, key_column]`` so rows sharing a timestamp are not skipped
+    when a page ends among them. ``since`` may be such a pair or a bare column
+    value. Both columns are also selected as ``_watermark``/``_watermark_key``
+    so rowid-style columns that ``*`` does not include can still be tracked.
+    """
+    for part in table.split(".") + [column, key_column]:
+        if not IDENTIFIER_PATTERN.match(part):
+            raise ValueError(f"Invalid identifier {part}")
+    quoted_table = ".".join(f"{quote}{part}{quote}" for part in table.split("."))
+    quoted_column = f"{quote}{column}{quote}"
+    quoted_key = f"{quote}{key_column}{quote}"
+    composite = column != key_column
+    query = f"SELECT *, {quoted_column} AS _watermark"
+    if composite:
+        query += f", {quoted_key} AS _watermark_key"
+    query += f" FROM {quoted_table}"
+    params: tuple = ()
+    if isinstance(since, list):
+        if len(since) != 2:
+            raise ValueError("since must be a watermark value or a [value, key] pair")
+        if composite:
+            query += f" WHERE ({quoted_column} > {placeholder} OR ({quoted_column} = {placeholder} AND {quoted_key} > {placeholder}))"
+            params = (since[0], since[0], since[1])
+        else:
+            query += f" WHERE {quoted_column} > {placeholder}"
+            params = (since[0],)
+    elif since is not None:
+        query += f" WHERE {quoted_column} > {placeholder}"
+        params = (since,)
+    query += f" ORDER BY {quoted_column}"
+    if composite:
+        query += f", {quoted_key}"
+    query += f" LIMIT {int(limit)}"
+    return query, params
+
+
+def advance_watermark(key: Tuple[str, str], rows: List[Dict[str, Any]]) -> Any:
+    """Strip the helper columns from ``rows`` and store the newest watermark."""
+    for row in rows:
+        watermark = row.pop("_watermark")
+        if "_watermark_key" in row:
+            watermark = [watermark, row.pop("_watermark_key")]
+    if rows:
+        change_cursors[key] = watermark
+    return change_cursors.get(key)
+
+
+CALCULATE_OPERATIONS = {
+    "add": operator.add,
+    "subtract": operator.sub,
+    "multiply": operator.mul,
+    "divide": operator.truediv
+}
+
+# Largest integer result returned by calculate; bigger ones cannot be encoded as JSON
+MAX_INTEGER_BITS = 4096
+
+# Longest expression accepted by calculate; the parser and evaluator are recursive
+MAX_EXPRESSION_LENGTH = 1000
+
+EXPRESSION_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos
+}
+
+
+def check_result(value: Any) -> Any:
+    """Reject results that cannot be returned as JSON numbers."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError("Result is not a real number")
+    if isinstance(value, float) and not math.isfinite(value):
+        raise OverflowError("Result is not finite")
+    if isinstance(value, int) and value.bit_length() > MAX_INTEGER_BITS:
+        raise OverflowError("Result too large")
+    return value
+
+
+def evaluate_expression(expression: str) -> Any:
+    """Safely evaluate an arithmetic expression such as ``(2 + 3) * 4``."""
+
+    def evaluate(node: ast.AST) -> Any:
+        if isinstance(node, ast.Expression):
+            return evaluate(node.body)
+        if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+            return node.value
+        if isinstance(node, ast.BinOp) and type(node.op) in EXPRESSION_OPERATORS:
+            left = evaluate(node.left)
+            right = evaluate(node.right)
+            if isinstance(node.op, ast.Pow):
+                if abs(right) > 1000:
+                    raise ValueError("Exponent too large")
+                # Bound the result before computing it, so nested powers stay cheap
+                if isinstance(left, int) and right > 0 and left.bit_length() * right > MAX_INTEGER_BITS:
+                    raise OverflowError("Result too large")
+            return check_result(EXPRESSION_OPERATORS[type(node.op)](left, right))
+        if isinstance(node, ast.UnaryOp) and type(node.op) in EXPRESSION_OPERATORS:
+            return check_result(EXPRESSION_OPERATORS[type(node.op)](evaluate(node.operand)))
+        raise ValueError(f"Unsupported expression element: {type(node).__name__}")
+
+    if not isinstance(expression, str):
+        raise TypeError("Expression must be a string")
+    if len(expression) > MAX_EXPRESSION_LENGTH:
+        raise ValueError(f"Expression longer than {MAX_EXPRESSION_LENGTH} characters")
+    return evaluate(ast.parse(expression, mode="eval"))
+
+
+def calculate_batch(operations: Any, a: Any, b: Any) -> Dict[str, Any]:
+    """Evaluate element-wise operations over operand arrays.
+
+    Scalars are broadcast against lists. Elements that divide by zero or
+    overflow yield ``None`` and are reported in ``errors`` instead of failing
+    the batch. NumPy is only used when every operand converts to its dtype
+    exactly; other batches take the exact Python loop.
+    """
+    lengths = {len(value) for value in (operations, a, b) if isinstance(value, list)}
+    if len(lengths) > 1:
+        raise ValueError("Operand and operation arrays must have the same length")
+    size = lengths.pop() if lengths else 1
+    operations = operations if isinstance(operations, list) else [operations] * size
+    a = a if isinstance(a, list) else [a] * size
+    b = b if isinstance(b, list) else [b] * size
+
+    unknown = set(operations) - set(CALCULATE_OPERATIONS)
+    if unknown:
+        raise ValueError(f"Unknown operation {sorted(unknown)[0]}")
+    for value in a + b:
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise TypeError(f"Operands must be numbers, got {value!r}")
+
+    errors: Dict[int, str] = {
+        i: "Division by zero"
+        for i in range(size)
+        if operations[i] == "divide" and b[i] == 0
+    }
+    operands = a + b
+    if np is not None and size and all(isinstance(value, int) and abs(value) <= 2 ** 31 for value in operands):
+        # int64 holds every sum and product of these exactly
+        dtype = np.int64
+    elif np is not None and size and all(isinstance(value, float) for value in operands):
+        dtype = np.float64
+    else:
+        dtype = None
+
+    if dtype is not None:
+        a_array = np.asarray(a, dtype=dtype)
+        b_array = np.asarray(b, dtype=dtype)
+        op_array = np.asarray(operations)
+        values = np.empty(size, dtype=object)
+        with np.errstate(all="ignore"):
+            for name in set(operations):
+                mask = op_array == name
+                if name == "divide":
+                    values[mask] = np.true_divide(a_array[mask], b_array[mask]).tolist()
+                else:
+                    values[mask] = CALCULATE_OPERATIONS[name](a_array[mask], b_array[mask]).tolist()
+        results = values.tolist()
+    else:
+        results = []
+        for i in range(size):
+            if i in errors:
+                results.append(None)
+                continue
+            try:
+                results.append(CALCULATE_OPERATIONS[operations[i]](a[i], b[i]))
+            except OverflowError as e:
+                results.append(None)
+                errors[i] = str(e)
+
+    for i in range(size):
+        if i in errors:
+            results[i] = None
+            continue
+        try:
+            check_result(results[i])
+        except (OverflowError, ValueError) as e:
+            results[i] = None
+            errors[i] = str(e)
+
+    return {
+        "results": results,
+        "errors": [{"index": i, "error": errors[i]} for i in sorted(errors)]
+    }
+
 
 @server.list_resources()
 async def handle_list_resources() -> list[types.Resource]:
@@ -59,7 +1777,9 @@ async def handle_list_resources() -> list[types.Resource]:
 @server.read_resource()
 async def handle_read_resource(uri: str) -> str:
     """Read a specific resource."""
-    if uri == "file://README.md":
+    # The SDK passes a pydantic AnyUrl, which lowercases the host and adds a trailing slash
+    uri = str(uri)
+    if uri.rstrip("/").lower() == "file://readme.md":
         return """# Example MCP Server
 
 This is an example Model Context Protocol server built with Python.
@@ -83,7 +1803,7 @@ Connect this server to any MCP-compatible client to start using its capabilities
             "created": "2024-01-01T00:00:00Z",
             "status": "active"
         }
-        return json.dumps(user_data, indent=2)
+        return dump_json(user_data)
     
     else:
         raise ValueError(f"Unknown resource: {uri}")
@@ -92,28 +1812,40 @@ Connect this server to any MCP-compatible client to start using its capabilities
 @server.list_tools()
 async def handle_list_tools() -> list[types.Tool]:
     """List available tools."""
-    return [
+    tools = [
         types.Tool(
             name="calculate",
-            description="Perform basic mathematical calculations",
+            description="Perform basic mathematical calculations. Pass arrays for operation/a/b, or a list of expressions, to evaluate a whole batch in one call",
             inputSchema={
                 "type": "object",
                 "properties": {
                     "operation": {
-                        "type": "string",
-                        "enum": ["add", "subtract", "multiply", "divide"],
-                        "description": "Mathematical operation to perform"
+                        "oneOf": [
+                            {"type": "string", "enum": ["add", "subtract", "multiply", "divide"]},
+                            {"type": "array", "items": {"type": "string", "enum": ["add", "subtract", "multiply", "divide"]}}
+                        ],
+                        "description": "Mathematical operation to perform, or one operation per element"
                     },
                     "a": {
-                        "type": "number",
-                        "description": "First number"
+                        "oneOf": [
+                            {"type": "number"},
+                            {"type": "array", "items": {"type": "number"}}
+                        ],
+                        "description": "First number, or an array of first operands"
                     },
                     "b": {
-                        "type": "number",
-                        "description": "Second number"
+                        "oneOf": [
+                            {"type": "number"},
+                            {"type": "array", "items": {"type": "number"}}
+                        ],
+                        "description": "Second number, or an array of second operands"
+                    },
+                    "expressions": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Arithmetic expressions to evaluate, e.g. \"(2 + 3) * 4\""
                     }
-                },
-                "required": ["operation", "a", "b"]
+                }
             }
         ),
         types.Tool(
@@ -124,8 +1856,14 @@ async def handle_list_tools() -> list[types.Tool]:
                 "properties": {
                     "type": {
                         "type": "string",
-                        "enum": ["time", "platform", "memory"],
+                        "enum": ["time", "platform", "memory", "cpu", "load", "disk", "network", "process", "snapshot", "history"],
                         "description": "Type of system information to retrieve"
+                    },
+                    "samples": {
+                        "type": "number",
+                        "minimum": 1,
+                        "default": 10,
+                        "description": "Number of recent samples to return for type 'history'"
                     }
                 },
                 "required": ["type"]
@@ -145,7 +1883,7 @@ async def handle_list_tools() -> list[types.Tool]:
                     "count": {
                         "type": "number",
                         "minimum": 1,
-                        "maximum": 10,
+                        "maximum": 10000,
                         "default": 1,
                         "description": "Number of items to generate"
                     }
@@ -159,6 +1897,36 @@ async def handle_list_tools() -> list[types.Tool]:
             inputSchema={
                 "type": "object",
                 "properties": {
+                    "cluster": {
+                        "type": "string",
+                        "description": "Named cluster from the cluster configuration; replaces host/port/user/password/database"
+                    },
+                    "action": {
+                        "type": "string",
+                        "enum": ["query", "changes"],
+                        "description": "query (run a SELECT) or changes (return rows added or updated since the cursor's last watermark)",
+                        "default": "query"
+                    },
+                    "table": {
+                        "type": "string",
+                        "description": "Table to poll for changes (action 'changes')"
+                    },
+                    "watermarkColumn": {
+                        "type": "string",
+                        "description": "Monotonic column used as the watermark, e.g. rowid, an auto-increment id or an updated_at timestamp (action 'changes')"
+                    },
+                    "keyColumn": {
+                        "type": "string",
+                        "description": "Unique column that orders rows sharing a watermark value (action 'changes')",
+                        "default": "id"
+                    },
+                    "cursor": {
+                        "type": "string",
+                        "description": "Name under which the last watermark is tracked (default: table.watermarkColumn)"
+                    },
+                    "since": {
+                        "description": "Explicit starting watermark, a value or a [value, key] pair as returned in watermark; overrides the tracked value"
+                    },
                     "host": {
                         "type": "string",
                         "description": "MySQL host"
@@ -182,7 +1950,7 @@ async def handle_list_tools() -> list[types.Tool]:
                     },
                     "query": {
                         "type": "string",
-                        "description": "SQL query to execute"
+                        "description": "SQL query to execute (action 'query')"
                     },
                     "limit": {
                         "type": "number",
@@ -190,54 +1958,372 @@ async def handle_list_tools() -> list[types.Tool]:
                         "maximum": 1000,
                         "default": 100,
                         "description": "Maximum number of rows to return"
+                    },
+                    "maxBytes": {
+                        "type": "number",
+                        "minimum": 1024,
+                        "description": "Byte budget for the returned rows (capped by the server-wide limit); larger results are truncated with a continuation token"
+                    },
+                    "continuation": {
+                        "type": "string",
+                        "description": "Continuation token from a truncated response to fetch the next rows of the same query"
+                    }
+                }
+            }
+        ),
+        types.Tool(
+            name="sqlite-query",
+            description="Execute SQLite queries and manage local database",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "database": {
+                        "type": "string",
+                        "description": "Database file path (relative to python-server directory)",
+                        "default": "data.db"
+                    },
+                    "workspace": {
+                        "type": "string",
+                        "description": "Name of an in-memory workspace to use instead of a database file"
+                    },
+                    "query": {
+                        "type": "string",
+                        "description": "SQL query to execute (action 'query')"
+                    },
+                    "action": {
+                        "type": "string",
+                        "enum": ["query", "init", "drop", "changes"],
+                        "description": "Action to perform: query (execute SQL), init (create sample tables), drop (delete database), changes (rows added or updated since the cursor's last watermark)",
+                        "default": "query"
+                    },
+                    "table": {
+                        "type": "string",
+                        "description": "Table to poll for changes (action 'changes')"
+                    },
+                    "watermarkColumn": {
+                        "type": "string",
+                        "description": "Monotonic column used as the watermark, e.g. rowid, an auto-increment id or an updated_at timestamp (action 'changes')"
+                    },
+                    "keyColumn": {
+                        "type": "string",
+                        "description": "Unique column that orders rows sharing a watermark value (action 'changes')",
+                        "default": "rowid"
+                    },
+                    "cursor": {
+                        "type": "string",
+                        "description": "Name under which the last watermark is tracked (default: table.watermarkColumn)"
+                    },
+                    "since": {
+                        "description": "Explicit starting watermark, a value or a [value, key] pair as returned in watermark; overrides the tracked value"
+                    },
+                    "limit": {
+                        "type": "number",
+                        "minimum": 1,
+                        "maximum": 1000,
+                        "default": 100,
+                        "description": "Maximum number of rows to return for SELECT queries"
+                    },
+                    "maxBytes": {
+                        "type": "number",
+                        "minimum": 1024,
+                        "description": "Byte budget for the returned rows (capped by the server-wide limit); larger results are truncated with a continuation token"
+                    },
+                    "continuation": {
+                        "type": "string",
+                        "description": "Continuation token from a truncated response to fetch the next rows of the same query"
+                    }
+                }
+            }
+        ),
+        types.Tool(
+            name="sqlite-workspace",
+            description="Manage named in-memory SQLite workspaces for throwaway analytics (use with sqlite-query's workspace parameter)",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "action": {
+                        "type": "string",
+                        "enum": ["create", "list", "attach", "detach", "snapshot", "restore", "drop"],
+                        "description": "create (new empty workspace, optionally loaded from database), list, attach/detach an on-disk database, snapshot to disk, restore from disk, drop"
+                    },
+                    "workspace": {
+                        "type": "string",
+                        "description": "Workspace name"
+                    },
+                    "database": {
+                        "type": "string",
+                        "description": "Database file path (relative to python-server directory) to attach, snapshot to, or restore from"
+                    },
+                    "alias": {
+                        "type": "string",
+                        "description": "Schema name for an attached database"
+                    }
+                },
+                "required": ["action"]
+            }
+        ),
+        types.Tool(
+            name="sqlite-fts-index",
+            description="Create, rebuild or drop an FTS5 full-text index over text columns of a SQLite table, kept in sync by triggers",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "database": {
+                        "type": "string",
+                        "description": "Database file path (relative to python-server directory)",
+                        "default": "data.db"
+                    },
+                    "workspace": {
+                        "type": "string",
+                        "description": "Name of an in-memory workspace to use instead of a database file"
+                    },
+                    "table": {
+                        "type": "string",
+                        "description": "Table to index"
+                    },
+                    "columns": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Text columns to index (required for create)"
+                    },
+                    "action": {
+                        "type": "string",
+                        "enum": ["create", "rebuild", "drop"],
+                        "description": "create (or replace) the index, rebuild it from the table, or drop it",
+                        "default": "create"
+                    }
+                },
+                "required": ["table"]
+            }
+        ),
+        types.Tool(
+            name="sqlite-search",
+            description="Full-text search a SQLite table through its FTS5 index, ranked by bm25 with snippets and pagination",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "database": {
+                        "type": "string",
+                        "description": "Database file path (relative to python-server directory)",
+                        "default": "data.db"
+                    },
+                    "workspace": {
+                        "type": "string",
+                        "description": "Name of an in-memory workspace to use instead of a database file"
+                    },
+                    "table": {
+                        "type": "string",
+                        "description": "Indexed table to search"
+                    },
+                    "query": {
+                        "type": "string",
+                        "description": "FTS5 match expression, e.g. \"laptop OR headphones\""
+                    },
+                    "limit": {
+                        "type": "number",
+                        "minimum": 1,
+                        "maximum": 1000,
+                        "default": 20,
+                        "description": "Maximum number of results per page"
+                    },
+                    "offset": {
+                        "type": "number",
+                        "minimum": 0,
+                        "default": 0,
+                        "description": "Number of results to skip"
+                    }
+                },
+                "required": ["table", "query"]
+            }
+        ),
+        types.Tool(
+            name="sqlite-index-advisor",
+            description="Inspect the recorded sqlite-query workload, find full table scans with EXPLAIN QUERY PLAN and propose or create indexes",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "action": {
+                        "type": "string",
+                        "enum": ["analyze", "workload", "apply", "reset"],
+                        "description": "analyze (explain hot statements and list proposals), workload (recorded statement stats), apply (create proposed indexes with before/after timing), reset (clear recorded workload)",
+                        "default": "analyze"
+                    },
+                    "indexes": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Index names to apply (default: all current proposals)"
+                    }
+                }
+            }
+        ),
+        types.Tool(
+            name="sqlite-aggregate",
+            description="Register and read materialized COUNT/SUM/AVG aggregate views over a SQLite table, maintained incrementally by triggers",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "action": {
+                        "type": "string",
+                        "enum": ["create", "read", "refresh", "drop", "list"],
+                        "description": "create (register a view), read (serve it), refresh (recompute from the table), drop, list",
+                        "default": "read"
+                    },
+                    "database": {
+                        "type": "string",
+                        "description": "Database file path (relative to python-server directory)",
+                        "default": "data.db"
+                    },
+                    "workspace": {
+                        "type": "string",
+                        "description": "Name of an in-memory workspace to use instead of a database file"
+                    },
+                    "name": {
+                        "type": "string",
+                        "description": "Aggregate view name"
+                    },
+                    "table": {
+                        "type": "string",
+                        "description": "Source table (create)"
+                    },
+                    "groupBy": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Columns to group by (create)"
+                    },
+                    "aggregates": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "function": {"type": "string", "enum": ["count", "sum", "avg"]},
+                                "column": {"type": "string"},
+                                "as": {"type": "string"}
+                            },
+                            "required": ["function"]
+                        },
+                        "description": "Aggregates to maintain (create), e.g. [{\"function\": \"avg\", \"column\": \"total\", \"as\": \"avg_total\"}]"
                     }
-                },
-                "required": ["host", "user", "password", "database", "query"]
+                }
             }
-        ),
-        types.Tool(
-            name="sqlite-query",
-            description="Execute SQLite queries and manage local database",
+        )
+    ]
+    
+    if ADMIN_TOKEN:
+        tools.append(types.Tool(
+            name="admin-profile",
+            description="Admin only: profile the running server (stack sampling or cProfile, optional tracemalloc) for a duration or number of tool calls",
             inputSchema={
                 "type": "object",
                 "properties": {
-                    "database": {
+                    "token": {
                         "type": "string",
-                        "description": "Database file path (relative to python-server directory)",
-                        "default": "data.db"
+                        "description": "Admin token"
                     },
-                    "query": {
+                    "action": {
                         "type": "string",
-                        "description": "SQL query to execute"
+                        "enum": ["start", "stop", "status"],
+                        "description": "start a session, stop it and get the report, or get status / the last report",
+                        "default": "status"
                     },
-                    "action": {
+                    "mode": {
                         "type": "string",
-                        "enum": ["query", "init", "drop"],
-                        "description": "Action to perform: query (execute SQL), init (create sample tables), drop (delete database)",
-                        "default": "query"
+                        "enum": ["sampling", "cprofile"],
+                        "description": "sampling (low overhead, collapsed stacks) or cprofile (exact, pstats file)",
+                        "default": "sampling"
                     },
-                    "limit": {
+                    "duration": {
+                        "type": "number",
+                        "minimum": 0.1,
+                        "description": "Seconds to profile before stopping automatically"
+                    },
+                    "calls": {
                         "type": "number",
                         "minimum": 1,
-                        "maximum": 1000,
-                        "default": 100,
-                        "description": "Maximum number of rows to return for SELECT queries"
+                        "description": "Number of tool calls to profile before stopping automatically"
+                    },
+                    "traceMemory": {
+                        "type": "boolean",
+                        "default": False,
+                        "description": "Also trace allocations with tracemalloc"
+                    },
+                    "top": {
+                        "type": "number",
+                        "minimum": 1,
+                        "maximum": 100,
+                        "default": 20,
+                        "description": "Number of entries in the summaries"
                     }
                 },
-                "required": ["query"]
+                "required": ["token"]
             }
-        )
-    ]
+        ))
+    
+    return tools
 
 
 @server.call_tool()
 async def handle_call_tool(name: str, arguments: dict) -> list[types.TextContent]:
     """Execute a tool with the given arguments."""
+    try:
+        request_id = server.request_context.request_id
+    except LookupError:
+        request_id = None  # called directly rather than through the MCP session
+    
+    with tracer.trace("tools/call", name, requestId=request_id) as span:
+        result = await call_tool(name, arguments)
+        span.set(responseBytes=sum(len(content.text) for content in result))
+    if profiler.active:
+        profiler.after_call(name)
+    return result
+
+
+async def call_tool(name: str, arguments: dict) -> list[types.TextContent]:
+    """Dispatch a tool call to its implementation."""
     
     if name == "calculate":
         operation = arguments.get("operation")
         a = arguments.get("a")
         b = arguments.get("b")
+        expressions = arguments.get("expressions")
+        
+        if expressions is not None:
+            results = []
+            errors = []
+            for i, expression in enumerate(expressions):
+                try:
+                    results.append(evaluate_expression(expression))
+                except ZeroDivisionError:
+                    results.append(None)
+                    errors.append({"index": i, "error": "Division by zero"})
+                except (ValueError, SyntaxError, TypeError, OverflowError) as e:
+                    results.append(None)
+                    errors.append({"index": i, "error": str(e)})
+                except (RecursionError, MemoryError):
+                    results.append(None)
+                    errors.append({"index": i, "error": "Expression too deeply nested"})
+            return [types.TextContent(
+                type="text",
+                text=dump_json({"results": results, "errors": errors}, pretty=False)
+            )]
+        
+        if any(isinstance(value, list) for value in (operation, a, b)):
+            try:
+                batch = calculate_batch(operation, a, b)
+            except (ValueError, TypeError) as e:
+                return [types.TextContent(
+                    type="text",
+                    text=f"Error: {str(e)}"
+                )]
+            return [types.TextContent(
+                type="text",
+                text=dump_json(batch, pretty=False)
+            )]
+        
+        if any(isinstance(value, bool) or not isinstance(value, (int, float)) for value in (a, b)):
+            return [types.TextContent(
+                type="text",
+                text="Error: Operands a and b must be numbers"
+            )]
         
         if operation == "add":
             result = a + b
@@ -271,8 +2357,28 @@ async def handle_call_tool(name: str, arguments: dict) -> list[types.TextContent
         elif info_type == "platform":
             info = f"Platform: {platform.system()} {platform.release()}, Python: {platform.python_version()}"
         elif info_type == "memory":
-            memory = psutil.virtual_memory()
-            info = f"Memory usage:\n- Total: {memory.total // 1024 // 1024}MB\n- Available: {memory.available // 1024 // 1024}MB\n- Used: {memory.used // 1024 // 1024}MB"
+            memory = system_sampler.latest()["memory"]
+            info = f"Memory usage:\n- Total: {memory['total'] // 1024 // 1024}MB\n- Available: {memory['available'] // 1024 // 1024}MB\n- Used: {memory['used'] // 1024 // 1024}MB"
+        elif info_type in ("cpu", "load", "disk", "network", "process", "snapshot"):
+            snapshot = system_sampler.latest()
+            sections = {
+                "cpu": "cpu",
+                "load": "loadAverage",
+                "disk": "diskIO",
+                "network": "networkIO",
+                "process": "process"
+            }
+            if info_type == "snapshot":
+                payload = snapshot
+            else:
+                payload = {
+                    "timestamp": snapshot["timestamp"],
+                    sections[info_type]: snapshot[sections[info_type]]
+                }
+            info = dump_json(payload)
+        elif info_type == "history":
+            samples = int(arguments.get("samples", 10))
+            info = dump_json(system_sampler.recent(samples))
         else:
             return [types.TextContent(
                 type="text",
@@ -286,91 +2392,110 @@ async def handle_call_tool(name: str, arguments: dict) -> list[types.TextContent
     
     elif name == "generate-data":
         data_type = arguments.get("type")
-        count = arguments.get("count", 1)
-        
-        def generate_user(id: int) -> Dict[str, Any]:
-            return {
-                "id": id,
-                "name": f"User {id}",
-                "email": f"user{id}@example.com",
-                "age": random.randint(18, 67),
-                "country": random.choice(["US", "UK", "CA", "AU", "DE"])
-            }
-        
-        def generate_product(id: int) -> Dict[str, Any]:
-            return {
-                "id": id,
-                "name": f"Product {id}",
-                "price": round(random.uniform(1, 100), 2),
-                "category": random.choice(["Electronics", "Clothing", "Books", "Home", "Sports"]),
-                "inStock": random.random() > 0.2
-            }
-        
-        def generate_order(id: int) -> Dict[str, Any]:
-            return {
-                "id": id,
-                "userId": random.randint(1, 100),
-                "productId": random.randint(1, 50),
-                "quantity": random.randint(1, 5),
-                "total": round(random.uniform(10, 500), 2),
-                "status": random.choice(["pending", "confirmed", "shipped", "delivered"])
-            }
+        count = int(arguments.get("count", 1))
         
-        if data_type == "user":
-            data = [generate_user(i + 1) for i in range(count)]
-        elif data_type == "product":
-            data = [generate_product(i + 1) for i in range(count)]
-        elif data_type == "order":
-            data = [generate_order(i + 1) for i in range(count)]
-        else:
+        if data_type not in DATA_GENERATORS:
             return [types.TextContent(
                 type="text",
                 text=f"Error: Unknown data type {data_type}"
             )]
         
+        with tracer.span("generate", count=count) as span:
+            if count >= PROCESS_POOL_MIN_ITEMS and get_process_pool() is not None:
+                span.set(offloaded=True)
+                text = await offload(generate_in_worker, data_type, count, JSON_PRETTY)
+            else:
+                text = dump_json(generate_records(data_type, count))
+        
         return [types.TextContent(
             type="text",
-            text=json.dumps(data, indent=2)
+            text=text
         )]
     
     elif name == "mysql-query":
+        cluster_name = arguments.get("cluster")
         host = arguments.get("host")
         port = arguments.get("port", 3306)
         user = arguments.get("user")
         password = arguments.get("password")
         database = arguments.get("database")
         query = arguments.get("query")
+        action = arguments.get("action", "query")
         limit = arguments.get("limit", 100)
+        max_bytes = min(int(arguments.get("maxBytes", MAX_RESPONSE_BYTES)), MAX_RESPONSE_BYTES)
+        continuation = arguments.get("continuation")
         
         try:
-            # Validate query type (only allow SELECT queries for safety)
-            trimmed_query = query.strip().lower()
-            if not trimmed_query.startswith('select'):
-                return [types.TextContent(
-                    type="text",
-                    text="Error: Only SELECT queries are allowed for security reasons"
-                )]
+            with tracer.span("validate", action=action):
+                if action == "changes":
+                    table = arguments.get("table")
+                    watermark_column = arguments.get("watermarkColumn")
+                    if not table or not watermark_column:
+                        return [types.TextContent(
+                            type="text",
+                            text="Error: table and watermarkColumn are required for action changes"
+                        )]
+                    source = f"mysql:{cluster_name}" if cluster_name else f"mysql:{host}:{port}/{database}"
+                    cursor_key = (source, arguments.get("cursor") or f"{table}.{watermark_column}")
+                    since = arguments.get("since", change_cursors.get(cursor_key))
+                    key_column = arguments.get("keyColumn", "id")
+                    final_query, params = changes_query(table, watermark_column, key_column, since, limit, "%s", "`")
+                else:
+                    if not query:
+                        return [types.TextContent(
+                            type="text",
+                            text="Error: query is required"
+                        )]
+                    
+                    # Validate query type (only allow SELECT queries for safety)
+                    trimmed_query = query.strip().lower()
+                    if not trimmed_query.startswith('select'):
+                        return [types.TextContent(
+                            type="text",
+                            text="Error: Only SELECT queries are allowed for security reasons"
+                        )]
+                
+                    # Add LIMIT clause if not already present
+                    final_query = query
+                    if 'limit' not in trimmed_query:
+                        final_query += f" LIMIT {limit}"
+                    params = ()
             
-            # Add LIMIT clause if not already present
-            final_query = query
-            if 'limit' not in trimmed_query:
-                final_query += f" LIMIT {limit}"
+            # Create MySQL connection, routed through the cluster when one is named
+            node = None
+            with tracer.span("connect", cluster=cluster_name, host=host) as span:
+                if cluster_name:
+                    connection, node = get_mysql_cluster(cluster_name).connect()
+                else:
+                    if host is None or user is None or database is None:
+                        return [types.TextContent(
+                            type="text",
+                            text="Error: host, user and database are required when no cluster is given"
+                        )]
+                    connection = mysql.connector.connect(
+                        host=host,
+                        port=port,
+                        user=user,
+                        password=password,
+                        database=database,
+                        connection_timeout=10
+                    )
+                if node is not None:
+                    span.set(host=MySQLCluster.node_key(node))
             
-            # Create MySQL connection
-            connection = mysql.connector.connect(
-                host=host,
-                port=port,
-                user=user,
-                password=password,
-                database=database,
-                connection_timeout=10
-            )
+            offset = parse_continuation(continuation, final_query) if continuation and action != "changes" else 0
             
             cursor = connection.cursor(dictionary=True)
-            cursor.execute(final_query)
+            with tracer.span("execute", db=database):
+                cursor.execute(continuation_query(final_query, offset) if offset else final_query, params)
             
-            rows = cursor.fetchall()
-            field_names = [desc[0] for desc in cursor.description] if cursor.description else []
+            with tracer.span("fetch") as span:
+                rows, size_hint, truncated = fetch_within_budget(cursor, max_bytes)
+                span.set(rowCount=len(rows), bytes=size_hint, truncated=truncated)
+            field_names = [desc[0] for desc in cursor.description if desc[0] not in ("_watermark", "_watermark_key")] if cursor.description else []
+            if truncated:
+                # Discard the unread remainder so the connection can be closed
+                connection.consume_results()
             
             results = {
                 "query": final_query,
@@ -378,13 +2503,31 @@ async def handle_call_tool(name: str, arguments: dict) -> list[types.TextContent
                 "data": rows,
                 "fields": field_names
             }
+            if action == "changes":
+                results["cursor"] = cursor_key[1]
+                results["since"] = since
+                results["watermark"] = advance_watermark(cursor_key, rows)
+                results["hasMore"] = truncated or len(rows) >= limit
+            elif truncated:
+                results["truncated"] = True
+                if len(set(field_names)) == len(field_names):
+                    results["continuation"] = make_continuation(final_query, offset + len(rows))
+                else:
+                    # MySQL rejects the derived table continuation_query() builds (ERROR 1060)
+                    results["continuationError"] = "Duplicate column names; alias them to get a continuation token"
+            if node is not None:
+                results["cluster"] = cluster_name
+                results["host"] = MySQLCluster.node_key(node)
             
             cursor.close()
             connection.close()
             
+            with tracer.span("serialize", bytes=size_hint), response_budget.hold(size_hint):
+                text = await encode_response(results, size_hint)
+            
             return [types.TextContent(
                 type="text",
-                text=json.dumps(results, indent=2, default=str)
+                text=text
             )]
             
         except MySQLError as e:
@@ -400,15 +2543,27 @@ async def handle_call_tool(name: str, arguments: dict) -> list[types.TextContent
     
     elif name == "sqlite-query":
         database = arguments.get("database", "data.db")
+        workspace = arguments.get("workspace")
         query = arguments.get("query")
         action = arguments.get("action", "query")
         limit = arguments.get("limit", 100)
+        max_bytes = min(int(arguments.get("maxBytes", MAX_RESPONSE_BYTES)), MAX_RESPONSE_BYTES)
+        continuation = arguments.get("continuation")
         
         # Ensure database path is relative to python-server directory
-        db_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), database)
+        db_path = os.path.join(SERVER_DIR, database)
+        if workspace:
+            database = f"workspace:{workspace}"
         
         try:
-            if action == "drop":
+            if action == "drop" and workspace:
+                dropped = drop_workspace(workspace)
+                return [types.TextContent(
+                    type="text",
+                    text=f"Workspace {workspace} dropped successfully" if dropped else f"Workspace {workspace} does not exist"
+                )]
+            
+            elif action == "drop":
                 if os.path.exists(db_path):
                     os.remove(db_path)
                     return [types.TextContent(
@@ -423,8 +2578,7 @@ async def handle_call_tool(name: str, arguments: dict) -> list[types.TextContent
             
             elif action == "init":
                 # Create sample database with tables
-                conn = sqlite3.connect(db_path)
-                conn.row_factory = sqlite3.Row
+                conn = sqlite_connect(db_path, workspace)
                 cursor = conn.cursor()
                 
                 # Create tables
@@ -455,7 +2609,9 @@ async def handle_call_tool(name: str, arguments: dict) -> list[types.TextContent
                         created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
                         FOREIGN KEY (user_id) REFERENCES users (id),
                         FOREIGN KEY (product_id) REFERENCES products (id)
-                    )"""
+                    )""",
+                    "CREATE INDEX IF NOT EXISTS idx_orders_user_id ON orders (user_id)",
+                    "CREATE INDEX IF NOT EXISTS idx_orders_product_id ON orders (product_id)"
                 ]
                 
                 for init_query in init_queries:
@@ -491,29 +2647,94 @@ async def handle_call_tool(name: str, arguments: dict) -> list[types.TextContent
                 cursor.executemany("INSERT OR IGNORE INTO orders (user_id, product_id, quantity, total, status) VALUES (?, ?, ?, ?, ?)", sample_orders)
                 
                 conn.commit()
-                conn.close()
+                if not workspace:
+                    conn.close()
                 
                 return [types.TextContent(
                     type="text",
                     text=f"Database {database} initialized with sample data successfully"
                 )]
             
+            elif action == "changes":
+                table = arguments.get("table")
+                watermark_column = arguments.get("watermarkColumn")
+                if not table or not watermark_column:
+                    return [types.TextContent(
+                        type="text",
+                        text="Error: table and watermarkColumn are required for action changes"
+                    )]
+                if not workspace and not os.path.exists(db_path):
+                    return [types.TextContent(
+                        type="text",
+                        text=f"Database {database} does not exist"
+                    )]
+                cursor_key = (f"sqlite:{workspace or db_path}", arguments.get("cursor") or f"{table}.{watermark_column}")
+                since = arguments.get("since", change_cursors.get(cursor_key))
+                key_column = arguments.get("keyColumn", "rowid")
+                final_query, params = changes_query(table, watermark_column, key_column, since, limit, "?", '"')
+                
+                with tracer.span("connect", db=database):
+                    conn = sqlite_connect(db_path, workspace)
+                try:
+                    with tracer.span("execute", db=database):
+                        cursor = conn.execute(final_query, params)
+                    with tracer.span("fetch") as span:
+                        data, size_hint, truncated = fetch_within_budget(cursor, max_bytes)
+                        span.set(rowCount=len(data), bytes=size_hint, truncated=truncated)
+                    field_names = [desc[0] for desc in cursor.description if desc[0] not in ("_watermark", "_watermark_key")]
+                finally:
+                    if not workspace:
+                        conn.close()
+                
+                results = {
+                    "database": database,
+                    "query": final_query,
+                    "cursor": cursor_key[1],
+                    "since": since,
+                    "watermark": advance_watermark(cursor_key, data),
+                    "rowCount": len(data),
+                    "hasMore": truncated or len(data) >= limit,
+                    "data": data,
+                    "fields": field_names
+                }
+                with tracer.span("serialize", bytes=size_hint), response_budget.hold(size_hint):
+                    text = await encode_response(results, size_hint)
+                return [types.TextContent(
+                    type="text",
+                    text=text
+                )]
+            
             else:  # action == "query"
-                conn = sqlite3.connect(db_path)
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
+                if not query:
+                    return [types.TextContent(
+                        type="text",
+                        text="Error: query is required"
+                    )]
+                
+                with tracer.span("validate", action=action):
+                    # Add LIMIT clause for SELECT queries if not present
+                    trimmed_query = query.strip().lower()
+                    final_query = query
+                    if trimmed_query.startswith('select') and 'limit' not in trimmed_query:
+                        final_query += f" LIMIT {limit}"
+                    
+                    offset = 0
+                    if continuation and trimmed_query.startswith('select'):
+                        offset = parse_continuation(continuation, final_query)
                 
-                # Add LIMIT clause for SELECT queries if not present
-                trimmed_query = query.strip().lower()
-                final_query = query
-                if trimmed_query.startswith('select') and 'limit' not in trimmed_query:
-                    final_query += f" LIMIT {limit}"
+                with tracer.span("connect", db=database):
+                    conn = sqlite_connect(db_path, workspace)
+                cursor = conn.cursor()
                 
-                cursor.execute(final_query)
+                start = time.perf_counter()
+                with tracer.span("execute", db=database):
+                    cursor.execute(continuation_query(final_query, offset) if offset else final_query)
                 
                 if trimmed_query.startswith('select'):
-                    rows = cursor.fetchall()
-                    data = [dict(row) for row in rows]
+                    with tracer.span("fetch") as span:
+                        data, size_hint, truncated = fetch_within_budget(cursor, max_bytes)
+                        span.set(rowCount=len(data), bytes=size_hint, truncated=truncated)
+                    index_advisor.record(db_path, workspace, final_query, time.perf_counter() - start)
                     field_names = [desc[0] for desc in cursor.description] if cursor.description else []
                     
                     results = {
@@ -523,9 +2744,13 @@ async def handle_call_tool(name: str, arguments: dict) -> list[types.TextContent
                         "data": data,
                         "fields": field_names
                     }
+                    if truncated:
+                        results["truncated"] = True
+                        results["continuation"] = make_continuation(final_query, offset + len(data))
                 else:
                     # For INSERT, UPDATE, DELETE queries
                     conn.commit()
+                    size_hint = 0
                     results = {
                         "database": database,
                         "query": final_query,
@@ -533,18 +2758,422 @@ async def handle_call_tool(name: str, arguments: dict) -> list[types.TextContent
                         "lastInsertId": cursor.lastrowid if cursor.lastrowid else None
                     }
                 
-                conn.close()
+                if not workspace:
+                    conn.close()
+                
+                with tracer.span("serialize", bytes=size_hint), response_budget.hold(size_hint):
+                    text = await encode_response(results, size_hint)
+                
+                return [types.TextContent(
+                    type="text",
+                    text=text
+                )]
                 
+        except sqlite3.Error as e:
+            rollback_workspace(workspace)
+            return [types.TextContent(
+                type="text",
+                text=f"SQLite Error: {str(e)}"
+            )]
+        except Exception as e:
+            rollback_workspace(workspace)
+            return [types.TextContent(
+                type="text",
+                text=f"Error: {str(e)}"
+            )]
+    
+    elif name == "sqlite-workspace":
+        action = arguments.get("action")
+        workspace = arguments.get("workspace")
+        database = arguments.get("database")
+        alias = arguments.get("alias")
+        
+        try:
+            if action == "list":
+                workspaces = []
+                for workspace_name, conn in sqlite_workspaces.items():
+                    schemas = [row["name"] for row in conn.execute("PRAGMA database_list")]
+                    tables = [row["name"] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+                    workspaces.append({"workspace": workspace_name, "schemas": schemas, "tables": tables})
+                return [types.TextContent(
+                    type="text",
+                    text=dump_json(workspaces)
+                )]
+            
+            if not workspace:
+                return [types.TextContent(
+                    type="text",
+                    text=f"Error: workspace is required for action {action}"
+                )]
+            
+            if action == "create":
+                if database:
+                    db_path = os.path.join(SERVER_DIR, database)
+                    if not os.path.exists(db_path):
+                        return [types.TextContent(
+                            type="text",
+                            text=f"Database {database} does not exist"
+                        )]
+                    conn = create_workspace(workspace)
+                    source = sqlite3.connect(db_path)
+                    try:
+                        source.backup(conn)
+                    except sqlite3.Error:
+                        drop_workspace(workspace)
+                        raise
+                    finally:
+                        source.close()
+                    text = f"Workspace {workspace} created from {database}"
+                else:
+                    create_workspace(workspace)
+                    text = f"Workspace {workspace} created"
+            
+            elif action == "drop":
+                dropped = drop_workspace(workspace)
+                text = f"Workspace {workspace} dropped successfully" if dropped else f"Workspace {workspace} does not exist"
+            
+            elif action in ("attach", "detach"):
+                conn = get_workspace(workspace)
+                if not alias or not IDENTIFIER_PATTERN.match(alias):
+                    return [types.TextContent(
+                        type="text",
+                        text="Error: a valid alias is required to attach or detach a database"
+                    )]
+                if action == "attach":
+                    if not database:
+                        return [types.TextContent(
+                            type="text",
+                            text="Error: database is required to attach"
+                        )]
+                    db_path = os.path.join(SERVER_DIR, database)
+                    if not os.path.exists(db_path):
+                        return [types.TextContent(
+                            type="text",
+                            text=f"Database {database} does not exist"
+                        )]
+                    conn.execute(f"ATTACH DATABASE ? AS {alias}", (db_path,))
+                    text = f"Database {database} attached to workspace {workspace} as {alias}"
+                else:
+                    conn.execute(f"DETACH DATABASE {alias}")
+                    text = f"Database {alias} detached from workspace {workspace}"
+            
+            elif action in ("snapshot", "restore"):
+                if not database:
+                    return [types.TextContent(
+                        type="text",
+                        text=f"Error: database is required to {action} a workspace"
+                    )]
+                db_path = os.path.join(SERVER_DIR, database)
+                # backup() never completes while the workspace has a transaction open
+                rollback_workspace(workspace)
+                if action == "snapshot":
+                    conn = get_workspace(workspace)
+                    target = sqlite3.connect(db_path)
+                    conn.backup(target)
+                    target.close()
+                    text = f"Workspace {workspace} saved to {database}"
+                else:
+                    if not os.path.exists(db_path):
+                        return [types.TextContent(
+                            type="text",
+                            text=f"Database {database} does not exist"
+                        )]
+                    conn = sqlite_workspaces.get(workspace) or create_workspace(workspace)
+                    source = sqlite3.connect(db_path)
+                    source.backup(conn)
+                    source.close()
+                    text = f"Workspace {workspace} restored from {database}"
+            
+            else:
+                return [types.TextContent(
+                    type="text",
+                    text=f"Error: Unknown workspace action {action}"
+                )]
+            
+            return [types.TextContent(
+                type="text",
+                text=text
+            )]
+        
+        except sqlite3.Error as e:
+            rollback_workspace(workspace)
+            return [types.TextContent(
+                type="text",
+                text=f"SQLite Error: {str(e)}"
+            )]
+        except Exception as e:
+            rollback_workspace(workspace)
+            return [types.TextContent(
+                type="text",
+                text=f"Error: {str(e)}"
+            )]
+    
+    elif name in ("sqlite-fts-index", "sqlite-search"):
+        database = arguments.get("database", "data.db")
+        workspace = arguments.get("workspace")
+        table = arguments.get("table")
+        db_path = os.path.join(SERVER_DIR, database)
+        if workspace:
+            database = f"workspace:{workspace}"
+        
+        try:
+            if not IDENTIFIER_PATTERN.match(table or ""):
                 return [types.TextContent(
                     type="text",
-                    text=json.dumps(results, indent=2, default=str)
+                    text=f"Error: Invalid table name {table}"
                 )]
+            if not workspace and not os.path.exists(db_path):
+                return [types.TextContent(
+                    type="text",
+                    text=f"Database {database} does not exist"
+                )]
+            
+            conn = sqlite_connect(db_path, workspace)
+            try:
+                if name == "sqlite-fts-index":
+                    action = arguments.get("action", "create")
+                    if action == "create":
+                        columns = arguments.get("columns") or []
+                        if not columns:
+                            return [types.TextContent(
+                                type="text",
+                                text="Error: columns are required to create a full-text index"
+                            )]
+                        fts = create_fts_index(conn, table, columns)
+                        text = f"Full-text index {fts} created on {table} ({', '.join(columns)})"
+                    elif action == "rebuild":
+                        conn.execute(f"INSERT INTO {table}_fts({table}_fts) VALUES ('rebuild')")
+                        text = f"Full-text index {table}_fts rebuilt"
+                    elif action == "drop":
+                        drop_fts_index(conn, table)
+                        text = f"Full-text index {table}_fts dropped"
+                    else:
+                        return [types.TextContent(
+                            type="text",
+                            text=f"Error: Unknown index action {action}"
+                        )]
+                    conn.commit()
+                    return [types.TextContent(
+                        type="text",
+                        text=text
+                    )]
                 
+                query = arguments.get("query")
+                limit = int(arguments.get("limit", 20))
+                offset = int(arguments.get("offset", 0))
+                fts = f"{table}_fts"
+                # Fetch one extra row to know whether another page exists
+                cursor = conn.execute(
+                    f"""SELECT t.*, bm25({fts}) AS rank,
+                              snippet({fts}, -1, '[', ']', '...', 12) AS snippet
+                       FROM {fts} JOIN {table} t ON t.rowid = {fts}.rowid
+                       WHERE {fts} MATCH ?
+                       ORDER BY rank
+                       LIMIT ? OFFSET ?""",
+                    (query, limit + 1, offset)
+                )
+                rows = [dict(row) for row in cursor.fetchall()]
+                has_more = len(rows) > limit
+                data = rows[:limit]
+                
+                results = {
+                    "database": database,
+                    "table": table,
+                    "query": query,
+                    "rowCount": len(data),
+                    "offset": offset,
+                    "nextOffset": offset + limit if has_more else None,
+                    "data": data
+                }
+                return [types.TextContent(
+                    type="text",
+                    text=dump_json(results)
+                )]
+            finally:
+                if not workspace:
+                    conn.close()
+        
+        except sqlite3.Error as e:
+            rollback_workspace(workspace)
+            return [types.TextContent(
+                type="text",
+                text=f"SQLite Error: {str(e)}"
+            )]
+        except Exception as e:
+            rollback_workspace(workspace)
+            return [types.TextContent(
+                type="text",
+                text=f"Error: {str(e)}"
+            )]
+    
+    elif name == "sqlite-index-advisor":
+        action = arguments.get("action", "analyze")
+        
+        try:
+            if action == "analyze":
+                recommendations = index_advisor.analyze()
+                results = {
+                    "analyzedAt": index_advisor.analyzed_at,
+                    "recommendations": recommendations
+                }
+            elif action == "workload":
+                results = [
+                    {
+                        "database": os.path.relpath(db_path, SERVER_DIR) if db_path else None,
+                        "workspace": workspace,
+                        "statement": statement,
+                        "count": stats["count"],
+                        "totalTimeMs": round(stats["totalTime"] * 1000, 3),
+                        "maxTimeMs": round(stats["maxTime"] * 1000, 3)
+                    }
+                    for (db_path, workspace, statement), stats in index_advisor.hot_statements()
+                ]
+            elif action == "apply":
+                if not index_advisor.recommendations:
+                    index_advisor.analyze()
+                results = {"applied": index_advisor.apply(arguments.get("indexes"))}
+            elif action == "reset":
+                index_advisor.workload.clear()
+                index_advisor.recommendations = []
+                return [types.TextContent(
+                    type="text",
+                    text="Index advisor workload cleared"
+                )]
+            else:
+                return [types.TextContent(
+                    type="text",
+                    text=f"Error: Unknown advisor action {action}"
+                )]
+            
+            return [types.TextContent(
+                type="text",
+                text=dump_json(results)
+            )]
+        
+        except sqlite3.Error as e:
+            return [types.TextContent(
+                type="text",
+                text=f"SQLite Error: {str(e)}"
+            )]
+        except Exception as e:
+            return [types.TextContent(
+                type="text",
+                text=f"Error: {str(e)}"
+            )]
+    
+    elif name == "sqlite-aggregate":
+        action = arguments.get("action", "read")
+        database = arguments.get("database", "data.db")
+        workspace = arguments.get("workspace")
+        view_name = arguments.get("name")
+        db_path = os.path.join(SERVER_DIR, database)
+        if workspace:
+            database = f"workspace:{workspace}"
+        
+        try:
+            if not workspace and not os.path.exists(db_path):
+                return [types.TextContent(
+                    type="text",
+                    text=f"Database {database} does not exist"
+                )]
+            if action != "list" and not view_name:
+                return [types.TextContent(
+                    type="text",
+                    text=f"Error: name is required for action {action}"
+                )]
+            
+            conn = sqlite_connect(db_path, workspace)
+            try:
+                if action == "create":
+                    definition = aggregate_definition(
+                        view_name,
+                        arguments.get("table"),
+                        arguments.get("groupBy") or [],
+                        arguments.get("aggregates") or []
+                    )
+                    create_aggregate(conn, definition)
+                    text = f"Aggregate view {view_name} created on {definition['table']}"
+                elif action == "refresh":
+                    refresh_aggregate(conn, load_aggregate(conn, view_name))
+                    conn.commit()
+                    text = f"Aggregate view {view_name} refreshed"
+                elif action == "drop":
+                    drop_aggregate(conn, view_name)
+                    text = f"Aggregate view {view_name} dropped"
+                elif action == "list":
+                    views = []
+                    if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = '_mcp_aggregates'").fetchone():
+                        views = [json.loads(row[0]) for row in conn.execute("SELECT definition FROM _mcp_aggregates ORDER BY name")]
+                    text = dump_json(views)
+                elif action == "read":
+                    definition = load_aggregate(conn, view_name)
+                    data = [dict(row) for row in conn.execute(aggregate_select(definition))]
+                    text = dump_json({
+                        "database": database,
+                        "name": view_name,
+                        "table": definition["table"],
+                        "rowCount": len(data),
+                        "data": data
+                    })
+                else:
+                    return [types.TextContent(
+                        type="text",
+                        text=f"Error: Unknown aggregate action {action}"
+                    )]
+            finally:
+                if not workspace:
+                    conn.close()
+            
+            return [types.TextContent(
+                type="text",
+                text=text
+            )]
+        
         except sqlite3.Error as e:
+            rollback_workspace(workspace)
             return [types.TextContent(
                 type="text",
                 text=f"SQLite Error: {str(e)}"
             )]
+        except Exception as e:
+            rollback_workspace(workspace)
+            return [types.TextContent(
+                type="text",
+                text=f"Error: {str(e)}"
+            )]
+    
+    elif name == "admin-profile" and ADMIN_TOKEN:
+        if not hmac.compare_digest(str(arguments.get("token", "")), ADMIN_TOKEN):
+            return [types.TextContent(
+                type="text",
+                text="Error: Invalid admin token"
+            )]
+        action = arguments.get("action", "status")
+        
+        try:
+            if action == "start":
+                results = profiler.start(
+                    arguments.get("mode", "sampling"),
+                    arguments.get("duration"),
+                    int(arguments["calls"]) if arguments.get("calls") else None,
+                    bool(arguments.get("traceMemory", False)),
+                    int(arguments.get("top", 20))
+                )
+            elif action == "stop":
+                results = profiler.stop()
+            elif action == "status":
+                results = profiler.status()
+            else:
+                return [types.TextContent(
+                    type="text",
+                    text=f"Error: Unknown profile action {action}"
+                )]
+            
+            return [types.TextContent(
+                type="text",
+                text=dump_json(results)
+            )]
+        
         except Exception as e:
             return [types.TextContent(
                 type="text",
@@ -743,7 +3372,14 @@ async def main():
         # writes to stderr while the protocol uses stdout.
         logger.info("Example MCP Server starting (stdio transport)")
 
-        async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
+        system_sampler.start()
+        index_advisor.start()
+
+        stdout = None
+        if tracer.enabled:
+            stdout = TracingStdout(anyio.wrap_file(io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8")))
+        
+        async with mcp.server.stdio.stdio_server(stdout=stdout) as (read_stream, write_stream):
             await server.run(
                 read_stream,
                 write_stream,
@@ -759,6 +3395,18 @@ async def main():
     except Exception as e:
         logger.error(f"Server error: {e}")
         sys.exit(1)
+    finally:
+        if profiler.active:
+            try:
+                profiler.stop()
+            except Exception as e:
+                logger.error(f"Profiling session could not be saved: {e}")
+        await system_sampler.stop()
+        await index_advisor.stop()
+        if process_pool is not None:
+            process_pool.shutdown(wait=False)
+        for workspace in list(sqlite_workspaces):
+            drop_workspace(workspace)
 
 
 if __name__ == "__main__":
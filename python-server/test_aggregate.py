@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+SQLite Aggregate View Test Script
+
+Checks that trigger-maintained aggregate views match a GROUP BY over the source
+table after inserts, updates and deletes.
+Run with pytest or directly: python3 test_aggregate.py
+"""
+
+import sys
+import os
+import asyncio
+import json
+import math
+import random
+
+# Add src directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from server import handle_call_tool, create_workspace, drop_workspace, get_workspace
+
+EXPECTED_QUERY = (
+    "SELECT status, COUNT(*) AS count, SUM(total) AS sum_total, AVG(total) AS avg_total "
+    "FROM orders GROUP BY status ORDER BY status"
+)
+
+
+def call(name, arguments):
+    result = asyncio.run(handle_call_tool(name, arguments))
+    return result[0].text
+
+
+def setup_module(module=None):
+    drop_workspace('test_aggregate')
+    create_workspace('test_aggregate')
+    call('sqlite-query', {'action': 'init', 'workspace': 'test_aggregate'})
+    text = call('sqlite-aggregate', {
+        'action': 'create',
+        'workspace': 'test_aggregate',
+        'name': 'orders_by_status',
+        'table': 'orders',
+        'groupBy': ['status'],
+        'aggregates': [
+            {'function': 'count', 'as': 'count'},
+            {'function': 'sum', 'column': 'total'},
+            {'function': 'avg', 'column': 'total', 'as': 'avg_total'}
+        ]
+    })
+    assert text == 'Aggregate view orders_by_status created on orders'
+
+
+def teardown_module(module=None):
+    drop_workspace('test_aggregate')
+
+
+def assert_view_matches_table():
+    view = json.loads(call('sqlite-aggregate', {'workspace': 'test_aggregate', 'name': 'orders_by_status'}))
+    expected = json.loads(call('sqlite-query', {'workspace': 'test_aggregate', 'query': EXPECTED_QUERY}))['data']
+    rows = sorted(view['data'], key=lambda row: row['status'])
+    assert [row['status'] for row in rows] == [row['status'] for row in expected]
+    for row, want in zip(rows, expected):
+        assert row['count'] == want['count']
+        assert abs(row['sum_total'] - want['sum_total']) < 1e-6
+        assert abs(row['avg_total'] - want['avg_total']) < 1e-6
+
+
+def test_initial_view():
+    assert_view_matches_table()
+
+
+def test_view_follows_writes():
+    for query in (
+        "INSERT INTO orders (user_id, product_id, quantity, total, status) VALUES (2, 1, 1, 999.99, 'pending')",
+        "UPDATE orders SET status = 'delivered' WHERE id = 3",
+        "DELETE FROM orders WHERE id = 2"
+    ):
+        call('sqlite-query', {'workspace': 'test_aggregate', 'query': query})
+        assert_view_matches_table()
+
+
+def test_list_and_refresh():
+    views = json.loads(call('sqlite-aggregate', {'action': 'list', 'workspace': 'test_aggregate'}))
+    assert [view['name'] for view in views] == ['orders_by_status']
+    assert call('sqlite-aggregate', {'action': 'refresh', 'workspace': 'test_aggregate', 'name': 'orders_by_status'}) == \
+        'Aggregate view orders_by_status refreshed'
+    assert_view_matches_table()
+
+
+def test_real_sums_do_not_drift():
+    conn = get_workspace('test_aggregate')
+    conn.execute("CREATE TABLE readings (id INTEGER PRIMARY KEY, sensor TEXT, value REAL)")
+    call('sqlite-aggregate', {
+        'action': 'create', 'workspace': 'test_aggregate', 'name': 'readings_by_sensor', 'table': 'readings',
+        'groupBy': ['sensor'],
+        'aggregates': [{'function': 'sum', 'column': 'value'}, {'function': 'avg', 'column': 'value'}]
+    })
+    rng = random.Random(7)
+    conn.executemany(
+        "INSERT INTO readings (sensor, value) VALUES (?, ?)",
+        [(f"s{i % 3}", rng.choice([0.1, 0.2, 0.3, 1e6 + 0.1, -7.7])) for i in range(3000)]
+    )
+    conn.execute("DELETE FROM readings WHERE id % 50 != 0")
+    conn.execute("UPDATE readings SET value = value + 0.1 WHERE id % 100 = 0")
+    conn.commit()
+    view = json.loads(call('sqlite-aggregate', {'workspace': 'test_aggregate', 'name': 'readings_by_sensor'}))
+    for row in view['data']:
+        values = [value for (value,) in conn.execute("SELECT value FROM readings WHERE sensor = ?", (row['sensor'],))]
+        assert math.isclose(row['sum_value'], math.fsum(values), rel_tol=1e-15)
+        assert math.isclose(row['avg_value'], math.fsum(values) / len(values), rel_tol=1e-15)
+
+
+def test_rejects_min_max():
+    text = call('sqlite-aggregate', {
+        'action': 'create', 'workspace': 'test_aggregate', 'name': 'bad', 'table': 'orders',
+        'aggregates': [{'function': 'max', 'column': 'total'}]
+    })
+    assert text.startswith('Error: Unsupported aggregate function max')
+
+
+if __name__ == "__main__":
+    setup_module()
+    try:
+        for name, test in list(globals().items()):
+            if name.startswith('test_'):
+                test()
+                print(f"✅ {name}")
+    finally:
+        teardown_module()
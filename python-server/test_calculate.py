@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Calculate Tool Test Script
+
+Checks the batch and expression modes of the calculate tool.
+Run with pytest or directly: python3 test_calculate.py
+"""
+
+import sys
+import os
+import asyncio
+import json
+
+# Add src directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from server import handle_call_tool
+
+
+def call(arguments):
+    result = asyncio.run(handle_call_tool('calculate', arguments))
+    return result[0].text
+
+
+def test_batch_matches_scalar_path():
+    data = json.loads(call({'operation': ['add', 'subtract', 'multiply', 'divide'], 'a': [1, 5, 3, 7], 'b': 2}))
+    assert data['results'] == [3, 3, 6, 3.5]
+    assert data['errors'] == []
+
+
+def test_batch_division_by_zero():
+    data = json.loads(call({'operation': 'divide', 'a': [1.0, 2.0], 'b': [0.0, 4.0]}))
+    assert data['results'] == [None, 0.5]
+    assert data['errors'] == [{'index': 0, 'error': 'Division by zero'}]
+
+
+def test_batch_keeps_integer_precision():
+    data = json.loads(call({'operation': 'multiply', 'a': [2 ** 53 + 1], 'b': [1]}))
+    assert data['results'] == [2 ** 53 + 1]
+    data = json.loads(call({'operation': 'multiply', 'a': [10 ** 200], 'b': [10 ** 200]}))
+    assert data['results'] == [10 ** 400]
+
+
+def test_batch_reports_overflow():
+    data = json.loads(call({'operation': 'multiply', 'a': [1e308, 2.0], 'b': [10.0, 3.0]}))
+    assert data['results'] == [None, 6.0]
+    assert data['errors'] == [{'index': 0, 'error': 'Result is not finite'}]
+    data = json.loads(call({'operation': 'multiply', 'a': [2 ** 3000], 'b': [2 ** 3000]}))
+    assert data['results'] == [None]
+    assert data['errors'][0]['error'] == 'Result too large'
+
+
+def test_expressions():
+    data = json.loads(call({'expressions': ['(2 + 3) * 4', '1 / 0', '2 ** 10']}))
+    assert data['results'] == [20, None, 1024]
+    assert data['errors'] == [{'index': 1, 'error': 'Division by zero'}]
+
+
+def test_expression_result_is_bounded():
+    data = json.loads(call({'expressions': ['(9 ** 999) ** 5', '((9 ** 999) ** 999) ** 999', '1e308 * 10']}))
+    assert data['results'] == [None, None, None]
+    assert [error['error'] for error in data['errors']] == ['Result too large', 'Result too large', 'Result is not finite']
+
+
+def test_expression_must_be_real():
+    data = json.loads(call({'expressions': ['(-8) ** 0.5', '-(2 ** 0.5)']}))
+    assert data['results'] == [None, -(2 ** 0.5)]
+    assert data['errors'] == [{'index': 0, 'error': 'Result is not a real number'}]
+
+
+def test_long_expressions_fail_per_element():
+    data = json.loads(call({'expressions': ['1' + '+1' * 1200, '-' * 999 + '1', '1' + '+1' * 400]}))
+    assert data['results'] == [None, None, 401]
+    assert [error['index'] for error in data['errors']] == [0, 1]
+
+
+def test_scalar_operands_are_validated():
+    assert call({'operation': 'add', 'a': 1}) == 'Error: Operands a and b must be numbers'
+    assert call({'operation': 'add', 'a': '1', 'b': 2}) == 'Error: Operands a and b must be numbers'
+    assert call({'operation': 'add', 'a': 1, 'b': 2}) == '1 add 2 = 3'
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith('test_'):
+            test()
+            print(f"✅ {name}")
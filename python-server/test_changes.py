@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Changes Mode Test Script
+
+Checks watermark polling with sqlite-query action "changes", including
+timestamp watermarks shared by several rows.
+Run with pytest or directly: python3 test_changes.py
+"""
+
+import sys
+import os
+import asyncio
+import json
+
+# Add src directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from server import handle_call_tool, handle_list_tools, create_workspace, drop_workspace, change_cursors
+
+
+def call(name, arguments):
+    result = asyncio.run(handle_call_tool(name, arguments))
+    return result[0].text
+
+
+def setup_function(function=None):
+    change_cursors.clear()
+    drop_workspace('test_changes')
+    create_workspace('test_changes')
+    call('sqlite-query', {'action': 'init', 'workspace': 'test_changes'})
+    # Every sample user shares one created_at value
+    call('sqlite-query', {'workspace': 'test_changes', 'query': "UPDATE users SET created_at = '2024-01-01 00:00:00'"})
+
+
+def teardown_function(function=None):
+    drop_workspace('test_changes')
+
+
+def poll(**arguments):
+    return json.loads(call('sqlite-query', {'action': 'changes', 'workspace': 'test_changes', 'table': 'users', **arguments}))
+
+
+def test_rowid_watermark_sees_inserts():
+    assert [row['id'] for row in poll(watermarkColumn='rowid')['data']] == [1, 2, 3, 4, 5]
+    assert poll(watermarkColumn='rowid')['data'] == []
+    call('sqlite-query', {'workspace': 'test_changes', 'query': "INSERT INTO users (name, email) VALUES ('New', 'new@example.com')"})
+    page = poll(watermarkColumn='rowid')
+    assert [row['id'] for row in page['data']] == [6]
+    assert page['watermark'] == 6
+
+
+def test_shared_timestamp_is_not_skipped():
+    ids = []
+    while True:
+        page = poll(watermarkColumn='created_at', limit=2)
+        ids += [row['id'] for row in page['data']]
+        if not page['hasMore']:
+            break
+    assert ids == [1, 2, 3, 4, 5]
+    assert page['watermark'] == ['2024-01-01 00:00:00', 5]
+
+
+def test_updates_seen_through_timestamp():
+    poll(watermarkColumn='created_at')
+    call('sqlite-query', {'workspace': 'test_changes', 'query': "UPDATE users SET created_at = '2024-01-02 00:00:00' WHERE id = 2"})
+    assert [row['id'] for row in poll(watermarkColumn='created_at')['data']] == [2]
+
+
+def test_fields_match_row_keys():
+    for watermark in ('rowid', 'created_at'):
+        change_cursors.clear()
+        page = poll(watermarkColumn=watermark)
+        assert all(list(row) == page['fields'] for row in page['data'])
+        assert '_watermark_key' not in page['fields']
+
+
+def test_explicit_since():
+    assert [row['id'] for row in poll(watermarkColumn='rowid', since=3)['data']] == [4, 5]
+    page = poll(watermarkColumn='created_at', since=['2024-01-01 00:00:00', 3], cursor='replay')
+    assert [row['id'] for row in page['data']] == [4, 5]
+
+
+def test_query_not_required_for_changes():
+    tools = {tool.name: tool for tool in asyncio.run(handle_list_tools())}
+    for name in ('sqlite-query', 'mysql-query'):
+        assert 'query' not in tools[name].inputSchema.get('required', [])
+    assert call('sqlite-query', {'workspace': 'test_changes'}) == 'Error: query is required'
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith('test_'):
+            setup_function()
+            try:
+                test()
+            finally:
+                teardown_function()
+            print(f"✅ {name}")
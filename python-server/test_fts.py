@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+SQLite Full-Text Search Test Script
+
+Checks sqlite-fts-index and sqlite-search against an in-memory workspace:
+ranked matches, trigger maintenance on writes and pagination.
+Run with pytest or directly: python3 test_fts.py
+"""
+
+import sys
+import os
+import asyncio
+import json
+
+# Add src directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from server import handle_call_tool, create_workspace, drop_workspace
+
+
+def call(name, arguments):
+    result = asyncio.run(handle_call_tool(name, arguments))
+    return result[0].text
+
+
+def setup_module(module=None):
+    drop_workspace('test_fts')
+    create_workspace('test_fts')
+    call('sqlite-query', {'action': 'init', 'workspace': 'test_fts', 'query': 'CREATE SAMPLE DATABASE'})
+    text = call('sqlite-fts-index', {'workspace': 'test_fts', 'table': 'products', 'columns': ['name', 'category']})
+    assert text == 'Full-text index products_fts created on products (name, category)'
+
+
+def teardown_module(module=None):
+    drop_workspace('test_fts')
+
+
+def search(query, **arguments):
+    return json.loads(call('sqlite-search', {'workspace': 'test_fts', 'table': 'products', 'query': query, **arguments}))
+
+
+def test_search_ranks_matches():
+    data = search('electronics')
+    assert {row['name'] for row in data['data']} == {'Laptop', 'Wireless Headphones'}
+    assert all('[Electronics]' in row['snippet'] for row in data['data'])
+
+
+def test_index_follows_writes():
+    call('sqlite-query', {'workspace': 'test_fts', 'query': "INSERT INTO products (name, price, category) VALUES ('Gaming Laptop', 1499.0, 'Electronics')"})
+    assert {row['name'] for row in search('laptop')['data']} == {'Laptop', 'Gaming Laptop'}
+    call('sqlite-query', {'workspace': 'test_fts', 'query': "UPDATE products SET name = 'Desktop' WHERE name = 'Gaming Laptop'"})
+    assert [row['name'] for row in search('desktop')['data']] == ['Desktop']
+    call('sqlite-query', {'workspace': 'test_fts', 'query': "DELETE FROM products WHERE name = 'Desktop'"})
+    assert search('desktop')['data'] == []
+
+
+def test_pagination():
+    first = search('electronics OR home', limit=2)
+    assert first['rowCount'] == 2 and first['nextOffset'] == 2
+    second = search('electronics OR home', limit=2, offset=first['nextOffset'])
+    assert second['rowCount'] == 1 and second['nextOffset'] is None
+
+
+def test_invalid_table():
+    assert call('sqlite-search', {'workspace': 'test_fts', 'table': 'products; DROP', 'query': 'x'}) == \
+        'Error: Invalid table name products; DROP'
+
+
+if __name__ == "__main__":
+    setup_module()
+    try:
+        for name, test in list(globals().items()):
+            if name.startswith('test_'):
+                test()
+                print(f"✅ {name}")
+    finally:
+        teardown_module()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+SQLite Index Advisor Test Script
+
+Checks that the index advisor proposes indexes for full scans in the recorded
+workload, keeps one proposal per leading column, and bounds sample timings.
+Run with pytest or directly: python3 test_index_advisor.py
+"""
+
+import sys
+import os
+import asyncio
+import json
+
+# Add src directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from server import handle_call_tool, create_workspace, drop_workspace, get_workspace, index_advisor
+
+
+def call(name, arguments):
+    result = asyncio.run(handle_call_tool(name, arguments))
+    return result[0].text
+
+
+def setup_function(function=None):
+    index_advisor.workload.clear()
+    index_advisor.recommendations = []
+    drop_workspace('test_advisor')
+    conn = create_workspace('test_advisor')
+    conn.execute("CREATE TABLE events (id INTEGER PRIMARY KEY, kind TEXT, user_id INTEGER, total REAL)")
+    conn.executemany(
+        "INSERT INTO events (kind, user_id, total) VALUES (?, ?, ?)",
+        [(f"kind{i % 7}", i % 50, i * 1.5) for i in range(2000)]
+    )
+    conn.commit()
+
+
+def teardown_function(function=None):
+    drop_workspace('test_advisor')
+
+
+def run_workload():
+    for query in ("SELECT * FROM events WHERE kind = 'kind1' AND user_id = 8 ORDER BY total",
+                  "SELECT id, total FROM events WHERE kind = 'kind2' ORDER BY total"):
+        call('sqlite-query', {'workspace': 'test_advisor', 'query': query})
+
+
+def test_overlapping_proposals_are_merged():
+    run_workload()
+    recommendations = json.loads(call('sqlite-index-advisor', {'action': 'analyze'}))['recommendations']
+    assert len(recommendations) == 1
+    assert recommendations[0]['columns'][0] == 'kind'
+    assert recommendations[0]['executions'] == 2
+
+    applied = json.loads(call('sqlite-index-advisor', {'action': 'apply'}))['applied']
+    assert len(applied) == 1
+    assert 'USING' in applied[0]['plan'][0]
+    indexes = [row[1] for row in get_workspace('test_advisor').execute("PRAGMA index_list(events)")]
+    assert indexes == [applied[0]['index']]
+    assert json.loads(call('sqlite-index-advisor', {'action': 'analyze'}))['recommendations'] == []
+
+
+def test_apply_skips_columns_indexed_since_analysis():
+    run_workload()
+    call('sqlite-index-advisor', {'action': 'analyze'})
+    get_workspace('test_advisor').execute("CREATE INDEX idx_manual ON events (kind)")
+    assert json.loads(call('sqlite-index-advisor', {'action': 'apply'}))['applied'] == []
+    assert index_advisor.recommendations == []
+
+
+def test_like_is_not_indexed():
+    call('sqlite-query', {'workspace': 'test_advisor', 'query': "SELECT * FROM events WHERE kind LIKE '%ind1%'"})
+    assert json.loads(call('sqlite-index-advisor', {'action': 'analyze'}))['recommendations'] == []
+
+
+def test_apply_drops_unused_index():
+    index_advisor.recommendations = [{
+        "index": "idx_events_total",
+        "sql": "CREATE INDEX idx_events_total ON events (total)",
+        "table": "events",
+        "columns": ["total"],
+        "database": None,
+        "workspace": "test_advisor",
+        "sample": "SELECT * FROM events WHERE kind LIKE '%ind1%'"
+    }]
+    assert json.loads(call('sqlite-index-advisor', {'action': 'apply'}))['applied'] == []
+    assert list(get_workspace('test_advisor').execute("PRAGMA index_list(events)")) == []
+    assert index_advisor.recommendations == []
+
+
+def test_sample_timing_is_bounded():
+    conn = get_workspace('test_advisor')
+    slow_query = "SELECT COUNT(*) FROM events a, events b, events c"
+    timeout = index_advisor.sample_timeout
+    index_advisor.sample_timeout = 0.05
+    try:
+        assert index_advisor.time_sample(conn, slow_query) is None
+        assert index_advisor.time_sample(conn, "SELECT * FROM events LIMIT 5") is not None
+    finally:
+        index_advisor.sample_timeout = timeout
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith('test_'):
+            setup_function()
+            try:
+                test()
+            finally:
+                teardown_function()
+            print(f"✅ {name}")
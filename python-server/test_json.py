@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+JSON Serializer Test Script
+
+Checks that dump_json encodes database values the same way with and without
+orjson installed.
+Run with pytest or directly: python3 test_json.py
+"""
+
+import sys
+import os
+import datetime
+import decimal
+import json
+
+# Add src directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import server
+from server import dump_json
+
+VALUE = {
+    "when": datetime.datetime(2024, 1, 2, 3, 4, 5),
+    "day": datetime.date(2024, 1, 2),
+    "price": decimal.Decimal("19.99"),
+    "blob": b"\x00\x01\x02",
+    "big": 2 ** 70,
+    "text": "héllo"
+}
+EXPECTED = {
+    "when": "2024-01-02T03:04:05",
+    "day": "2024-01-02",
+    "price": "19.99",
+    "blob": "AAEC",
+    "big": 2 ** 70,
+    "text": "héllo"
+}
+
+
+def test_encodes_database_values():
+    assert json.loads(dump_json(VALUE)) == EXPECTED
+
+
+def test_stdlib_fallback_matches():
+    original = server.orjson
+    server.orjson = None
+    try:
+        assert json.loads(dump_json(VALUE)) == EXPECTED
+    finally:
+        server.orjson = original
+
+
+def test_compact_output():
+    assert dump_json({"a": [1, 2]}, pretty=False) == '{"a":[1,2]}'
+    assert "\n" in dump_json({"a": [1, 2]}, pretty=True)
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith('test_'):
+            test()
+            print(f"✅ {name}")
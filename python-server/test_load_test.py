@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Load Generator Test Script
+
+Checks the load generator's failure detection and runs a short load test
+against a real server process over stdio.
+Run with pytest or directly: python3 test_load_test.py
+"""
+
+import sys
+import os
+import argparse
+import asyncio
+import tempfile
+
+# Add src directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from load_test import is_failure, run_load, DEFAULT_MIX
+from server import handle_read_resource
+
+
+def text_response(text):
+    return {"jsonrpc": "2.0", "id": 1, "result": {"content": [{"type": "text", "text": text}]}}
+
+
+def test_is_failure():
+    assert not is_failure(text_response('{"rowCount": 1}'))
+    assert is_failure(text_response("SQLite Error: no such table: users"))
+    assert is_failure(text_response("Error: Unknown tool nope"))
+    assert is_failure({"jsonrpc": "2.0", "id": 1, "error": {"code": -32601, "message": "Method not found"}})
+    assert is_failure({"jsonrpc": "2.0", "id": 1, "result": {"content": [], "isError": True}})
+
+
+def test_read_resource_uri_forms():
+    for uri in ("file://README.md", "file://readme.md/", "FILE://README.MD"):
+        assert asyncio.run(handle_read_resource(uri)).startswith("# Example MCP Server")
+
+
+def test_short_load_run():
+    with tempfile.TemporaryDirectory() as directory:
+        args = argparse.Namespace(
+            servers=1, rate=20.0, concurrency=4, duration=1.0, mix=DEFAULT_MIX,
+            database=os.path.join(directory, "load.db"), rss_interval=0.5
+        )
+        report = asyncio.run(run_load(args))
+    assert report["completed"] == report["sent"] > 0
+    assert report["errors"] == 0
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith('test_'):
+            test()
+            print(f"✅ {name}")
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+MySQL Tool Test Script
+
+Checks replica selection and failover of MySQLCluster, and result paging in
+mysql-query, against fake connections so no MySQL server is needed.
+Run with pytest or directly: python3 test_mysql_cluster.py
+"""
+
+import sys
+import os
+import asyncio
+import json
+
+# Add src directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import server
+from server import MySQLCluster, MySQLError, handle_call_tool
+
+
+class FakeCursor:
+    def __init__(self, status):
+        self.status = status
+
+    def execute(self, statement):
+        pass
+
+    def fetchone(self):
+        return self.status
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, host, status):
+        self.host = host
+        self.status = status
+        self.closed = False
+
+    def cursor(self, dictionary=False):
+        return FakeCursor(self.status)
+
+    def close(self):
+        self.closed = True
+
+
+def make_cluster(statuses, **config):
+    """Build a cluster whose nodes answer replica status from ``statuses``."""
+    def connect(host, **kwargs):
+        if statuses.get(host) == "down":
+            raise MySQLError(msg="Can't connect")
+        return FakeConnection(host, statuses.get(host))
+
+    server.mysql.connector.connect = connect
+    return MySQLCluster("test", {
+        "primary": {"host": "primary"},
+        "replicas": [{"host": "replica1"}, {"host": "replica2"}],
+        **config
+    })
+
+
+def test_prefers_healthy_replica():
+    original = server.mysql.connector.connect
+    try:
+        cluster = make_cluster({
+            "replica1": {"Seconds_Behind_Source": 0},
+            "replica2": {"Seconds_Behind_Source": 1}
+        })
+        connection, node = cluster.connect()
+        assert node["host"] in ("replica1", "replica2")
+    finally:
+        server.mysql.connector.connect = original
+
+
+def test_skips_down_and_lagging_replicas():
+    original = server.mysql.connector.connect
+    try:
+        cluster = make_cluster({
+            "replica1": "down",
+            "replica2": {"Seconds_Behind_Source": 120}
+        }, maxReplicationLag=30)
+        connection, node = cluster.connect()
+        assert node["host"] == "primary"
+        assert cluster.node_health({"host": "replica1"})["downUntil"] > 0
+    finally:
+        server.mysql.connector.connect = original
+
+
+def test_stopped_replication_marks_replica_down():
+    original = server.mysql.connector.connect
+    try:
+        cluster = make_cluster({
+            "replica1": {"Seconds_Behind_Source": None},
+            "replica2": {"Seconds_Behind_Source": None}
+        })
+        for _ in range(3):
+            connection, node = cluster.connect()
+            assert node["host"] == "primary"
+        assert all(cluster.node_health(replica)["downUntil"] > 0 for replica in cluster.replicas)
+        assert [candidate["host"] for candidate in cluster.candidates()] == ["primary"]
+    finally:
+        server.mysql.connector.connect = original
+
+
+class FakeResultCursor:
+    """Dictionary cursor over fixed rows; duplicate column names collapse as in mysql-connector."""
+
+    def __init__(self, columns, rows):
+        self.description = [(column,) for column in columns]
+        self.rows = [dict(zip(columns, row)) for row in rows]
+
+    def execute(self, query, params=()):
+        pass
+
+    def fetchmany(self, size):
+        batch, self.rows = self.rows[:size], self.rows[size:]
+        return batch
+
+    def close(self):
+        pass
+
+
+class FakeResultConnection:
+    def __init__(self, columns, rows):
+        self.columns = columns
+        self.rows = rows
+
+    def cursor(self, dictionary=False):
+        return FakeResultCursor(self.columns, self.rows)
+
+    def consume_results(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def query_fake(columns, rows):
+    original = server.mysql.connector.connect
+    server.mysql.connector.connect = lambda **kwargs: FakeResultConnection(columns, rows)
+    try:
+        result = asyncio.run(handle_call_tool('mysql-query', {
+            'host': 'localhost', 'user': 'test', 'database': 'test',
+            'query': 'SELECT o.id, u.id, o.note FROM orders o JOIN users u ON o.user_id = u.id',
+            'maxBytes': 500
+        }))
+        return json.loads(result[0].text)
+    finally:
+        server.mysql.connector.connect = original
+
+
+def test_truncated_result_gets_continuation():
+    data = query_fake(['order_id', 'user_id', 'note'], [(i, i, 'x' * 100) for i in range(10)])
+    assert data['truncated'] and 'continuation' in data
+
+
+def test_duplicate_columns_get_no_continuation():
+    data = query_fake(['id', 'id', 'note'], [(i, i, 'x' * 100) for i in range(10)])
+    assert data['truncated'] and 'continuation' not in data
+    assert 'Duplicate column names' in data['continuationError']
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith('test_'):
+            test()
+            print(f"✅ {name}")
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Process Pool Test Script
+
+Checks that generate-data and result encoding produce the same output when
+offloaded to spawned worker processes, and that shared memory is released.
+Run with pytest or directly: python3 test_process_pool.py
+"""
+
+import sys
+import os
+import asyncio
+import json
+
+# Add src directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import server
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def setup_module(module=None):
+    server.PROCESS_POOL_WORKERS = 2
+
+
+def teardown_module(module=None):
+    if server.process_pool is not None:
+        server.process_pool.shutdown()
+        server.process_pool = None
+    server.PROCESS_POOL_WORKERS = 0
+
+
+def test_generate_in_worker():
+    text = run(server.offload(server.generate_in_worker, "user", 2000, False))
+    users = json.loads(text)
+    assert len(users) == 2000
+    assert users[0]["email"] == "user1@example.com"
+
+
+def test_encode_offload_without_orjson():
+    value = {"data": [{"id": i, "body": "x" * 100} for i in range(20000)]}
+    original = server.orjson
+    server.orjson = None
+    try:
+        text = run(server.encode_response(value, server.PROCESS_POOL_MIN_BYTES))
+    finally:
+        server.orjson = original
+    assert json.loads(text) == value
+
+
+def test_shared_memory_is_released():
+    name, size = server.write_shared_text("héllo")
+    assert server.read_shared_text(name, size) == "héllo"
+    try:
+        server.shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        pass
+    else:
+        raise AssertionError("shared memory block was not unlinked")
+
+
+if __name__ == "__main__":
+    setup_module()
+    try:
+        for name, test in list(globals().items()):
+            if name.startswith('test_'):
+                test()
+                print(f"✅ {name}")
+    finally:
+        teardown_module()
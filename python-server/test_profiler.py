@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Profiling Tool Test Script
+
+Checks the admin-profile tool: token gating, call budgets, output files and
+that a failing report write does not lose the profiled call's result.
+Run with pytest or directly: python3 test_profiler.py
+"""
+
+import sys
+import os
+import asyncio
+import json
+import tempfile
+
+# Add src directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import server
+from server import handle_call_tool, handle_list_tools, profiler
+
+
+def call(name, arguments):
+    result = asyncio.run(handle_call_tool(name, arguments))
+    return result[0].text
+
+
+def admin(**arguments):
+    return json.loads(call('admin-profile', {'token': 'secret', **arguments}))
+
+
+def setup_function(function=None):
+    server.ADMIN_TOKEN = 'secret'
+
+
+def teardown_function(function=None):
+    server.ADMIN_TOKEN = None
+    if profiler.active:
+        profiler.stop()
+
+
+def test_hidden_without_token():
+    server.ADMIN_TOKEN = None
+    assert 'admin-profile' not in [tool.name for tool in asyncio.run(handle_list_tools())]
+    assert call('admin-profile', {'token': ''}) == 'Error: Unknown tool admin-profile'
+    server.ADMIN_TOKEN = 'secret'
+    assert call('admin-profile', {'token': 'wrong'}) == 'Error: Invalid admin token'
+
+
+def test_call_budget_excludes_admin_calls():
+    with tempfile.TemporaryDirectory() as directory:
+        profiler.output_dir = directory
+        for mode, extension in (('sampling', '.collapsed'), ('cprofile', '.prof')):
+            assert admin(action='start', mode=mode, calls=2, traceMemory=True, top=5)['callsSeen'] == 0
+            assert admin(action='status')['callsSeen'] == 0
+            call('calculate', {'operation': 'add', 'a': 1, 'b': 2})
+            assert admin(action='status')['active']
+            call('generate-data', {'type': 'order', 'count': 200})
+            report = admin(action='status')['lastReport']
+            assert not profiler.active
+            assert report['mode'] == mode and report['toolCalls'] == 2
+            assert any(path.endswith(extension) for path in report['files'])
+            assert all(os.path.exists(path) for path in report['files'])
+            assert report['topAllocations']
+
+
+def test_failed_report_keeps_result():
+    with tempfile.TemporaryDirectory() as directory:
+        blocker = os.path.join(directory, 'file')
+        open(blocker, 'w').close()
+        profiler.output_dir = os.path.join(blocker, 'profiles')
+        admin(action='start', mode='cprofile', calls=1)
+        assert call('calculate', {'operation': 'add', 'a': 1, 'b': 2}) == '1 add 2 = 3'
+        assert not profiler.active
+        assert sys.getprofile() is None
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith('test_'):
+            setup_function()
+            try:
+                test()
+            finally:
+                teardown_function()
+            print(f"✅ {name}")
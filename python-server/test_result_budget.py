@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Result Budget Test Script
+
+Checks byte-budgeted fetching in sqlite-query: truncation with continuation
+tokens, the server-wide in-flight budget and oversized value capping.
+Run with pytest or directly: python3 test_result_budget.py
+"""
+
+import sys
+import os
+import asyncio
+import json
+
+# Add src directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import server
+from server import handle_call_tool, create_workspace, drop_workspace, cap_value, response_budget
+
+
+def call(name, arguments):
+    result = asyncio.run(handle_call_tool(name, arguments))
+    return result[0].text
+
+
+def setup_module(module=None):
+    drop_workspace('test_budget')
+    conn = create_workspace('test_budget')
+    conn.execute("CREATE TABLE notes (id INTEGER PRIMARY KEY, body TEXT)")
+    conn.executemany("INSERT INTO notes (body) VALUES (?)", [("x" * 1000,) for _ in range(50)])
+    conn.commit()
+
+
+def teardown_module(module=None):
+    drop_workspace('test_budget')
+
+
+def query(**arguments):
+    return json.loads(call('sqlite-query', {
+        'workspace': 'test_budget',
+        'query': 'SELECT id, body FROM notes ORDER BY id',
+        **arguments
+    }))
+
+
+def test_continuation_pages_through_all_rows():
+    ids = []
+    page = query(maxBytes=10000)
+    while True:
+        assert page['rowCount'] < 50
+        ids += [row['id'] for row in page['data']]
+        if not page.get('truncated'):
+            break
+        page = query(maxBytes=10000, continuation=page['continuation'])
+    assert ids == list(range(1, 51))
+
+
+def test_inflight_budget_limits_fetch():
+    with response_budget.hold(response_budget.limit - 5000):
+        page = query()
+    assert page['truncated'] and 1 <= page['rowCount'] <= 5
+    assert response_budget.in_use == 0
+
+
+def test_cap_value_counts_bytes():
+    limit = server.MAX_VALUE_BYTES
+    text = "é" * limit
+    capped = cap_value(text)
+    kept = capped.split("... [truncated")[0]
+    assert len(kept.encode('utf-8')) <= limit
+    assert capped.endswith(f"[truncated {len(text.encode('utf-8')) - len(kept.encode('utf-8'))} bytes]")
+    assert cap_value("a" * limit) == "a" * limit
+    assert cap_value(b"\0" * (limit + 1)) == f"<binary {limit + 1} bytes, truncated>"
+
+
+if __name__ == "__main__":
+    setup_module()
+    try:
+        for name, test in list(globals().items()):
+            if name.startswith('test_'):
+                test()
+                print(f"✅ {name}")
+    finally:
+        teardown_module()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+System Info Test Script
+
+Checks the get-system-info types served from the background sampler's cached
+snapshot and history ring buffer.
+Run with pytest or directly: python3 test_system_info.py
+"""
+
+import sys
+import os
+import asyncio
+import json
+
+# Add src directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from server import handle_call_tool, SystemSampler, system_sampler
+
+
+def call(arguments):
+    result = asyncio.run(handle_call_tool('get-system-info', arguments))
+    return result[0].text
+
+
+def test_snapshot_sections():
+    snapshot = json.loads(call({'type': 'snapshot'}))
+    for section in ('cpu', 'loadAverage', 'memory', 'diskIO', 'networkIO', 'process'):
+        assert section in snapshot
+    cpu = json.loads(call({'type': 'cpu'}))
+    assert set(cpu) == {'timestamp', 'cpu'}
+    assert cpu['timestamp'] == system_sampler.latest()['timestamp']
+    assert call({'type': 'memory'}).startswith('Memory usage:')
+
+
+def test_history_is_bounded():
+    sampler = SystemSampler(interval=60, history_size=3)
+    for _ in range(5):
+        sampler.sample()
+    assert len(sampler.recent(10)) == 3
+    assert sampler.recent(2) == list(sampler.history)[-2:]
+    assert sampler.recent(0) == sampler.recent(-2) == list(sampler.history)[-1:]
+    assert len(json.loads(call({'type': 'history', 'samples': 1}))) == 1
+
+
+def test_background_task_samples():
+    async def run():
+        sampler = SystemSampler(interval=0.05, history_size=10)
+        sampler.start()
+        await asyncio.sleep(0.3)
+        await sampler.stop()
+        return sampler
+
+    sampler = asyncio.run(run())
+    assert len(sampler.history) >= 2
+    assert sampler._task is None
+
+
+def test_unknown_type():
+    assert call({'type': 'gpu'}) == 'Error: Unknown info type gpu'
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith('test_'):
+            test()
+            print(f"✅ {name}")
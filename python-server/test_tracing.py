@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Request Tracing Test Script
+
+Runs a server process with NDJSON tracing enabled and checks the spans of a
+tool call, including the stdout write of its response.
+Run with pytest or directly: python3 test_tracing.py
+"""
+
+import sys
+import os
+import asyncio
+import json
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from load_test import ServerProcess
+
+
+async def traced_calls(trace_file):
+    os.environ["MCP_TRACE_FILE"] = trace_file
+    try:
+        server = ServerProcess(0)
+        await server.start()
+    finally:
+        del os.environ["MCP_TRACE_FILE"]
+    await server.request("tools/call", {"name": "generate-data", "arguments": {"type": "user", "count": 500}})
+    await server.request("tools/call", {"name": "sqlite-query", "arguments": {"action": "init", "workspace": "nope"}})
+    await server.stop()
+
+
+def test_tool_call_spans():
+    with tempfile.TemporaryDirectory() as directory:
+        trace_file = os.path.join(directory, "trace.ndjson")
+        asyncio.run(traced_calls(trace_file))
+        with open(trace_file, encoding="utf-8") as f:
+            spans = [json.loads(line) for line in f]
+
+    roots = [span for span in spans if span["name"] == "tools/call"]
+    assert [root["attributes"]["tool"] for root in roots] == ["generate-data", "sqlite-query"]
+    generate = roots[0]
+    children = {span["name"]: span for span in spans if span.get("parentSpanId") == generate["spanId"]}
+    assert set(children) == {"generate", "write"}
+    assert children["write"]["attributes"]["bytes"] > generate["attributes"]["responseBytes"]
+    assert all(span["traceId"] == generate["traceId"] for span in children.values())
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith('test_'):
+            test()
+            print(f"✅ {name}")
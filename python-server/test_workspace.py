@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+SQLite Workspace Test Script
+
+Checks in-memory workspaces: create, query, snapshot, restore and recovery
+after failed statements. Databases are written to a temporary directory.
+Run with pytest or directly: python3 test_workspace.py
+"""
+
+import sys
+import os
+import asyncio
+import json
+import tempfile
+
+# Add src directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from server import handle_call_tool, sqlite_workspaces, drop_workspace
+
+
+def call(name, arguments):
+    result = asyncio.run(handle_call_tool(name, arguments))
+    return result[0].text
+
+
+def init_workspace(workspace):
+    drop_workspace(workspace)
+    assert call('sqlite-workspace', {'action': 'create', 'workspace': workspace}) == f"Workspace {workspace} created"
+    call('sqlite-query', {'action': 'init', 'workspace': workspace, 'query': 'CREATE SAMPLE DATABASE'})
+
+
+def test_query_workspace():
+    init_workspace('test_query')
+    data = json.loads(call('sqlite-query', {'workspace': 'test_query', 'query': 'SELECT COUNT(*) AS count FROM users'}))
+    assert data['database'] == 'workspace:test_query'
+    assert data['data'] == [{'count': 5}]
+    drop_workspace('test_query')
+
+
+def test_snapshot_and_restore():
+    init_workspace('test_snapshot')
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'snapshot.db')
+        assert call('sqlite-workspace', {'action': 'snapshot', 'workspace': 'test_snapshot', 'database': path}) == \
+            f"Workspace test_snapshot saved to {path}"
+        drop_workspace('test_snapshot')
+        call('sqlite-workspace', {'action': 'restore', 'workspace': 'test_restore', 'database': path})
+        data = json.loads(call('sqlite-query', {'workspace': 'test_restore', 'query': 'SELECT COUNT(*) AS count FROM orders'}))
+        assert data['data'] == [{'count': 5}]
+    drop_workspace('test_restore')
+
+
+def test_failed_write_is_rolled_back():
+    init_workspace('test_rollback')
+    text = call('sqlite-query', {
+        'workspace': 'test_rollback',
+        'query': "INSERT INTO users (name, email) VALUES ('Duplicate', 'alice@example.com')"
+    })
+    assert text.startswith('SQLite Error: UNIQUE constraint failed')
+    assert not sqlite_workspaces['test_rollback'].in_transaction
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'snapshot.db')
+        assert call('sqlite-workspace', {'action': 'snapshot', 'workspace': 'test_rollback', 'database': path}) == \
+            f"Workspace test_rollback saved to {path}"
+    drop_workspace('test_rollback')
+
+
+def test_create_from_missing_database():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'missing.db')
+        assert call('sqlite-workspace', {'action': 'create', 'workspace': 'test_missing', 'database': path}) == \
+            f"Database {path} does not exist"
+        assert not os.path.exists(path)
+    assert 'test_missing' not in sqlite_workspaces
+
+
+def test_attach_missing_database():
+    init_workspace('test_attach')
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'missing.db')
+        assert call('sqlite-workspace', {'action': 'attach', 'workspace': 'test_attach', 'database': path, 'alias': 'other'}) == \
+            f"Database {path} does not exist"
+        assert not os.path.exists(path)
+        path = os.path.join(directory, 'other.db')
+        call('sqlite-workspace', {'action': 'snapshot', 'workspace': 'test_attach', 'database': path})
+        assert call('sqlite-workspace', {'action': 'attach', 'workspace': 'test_attach', 'database': path, 'alias': 'other'}) == \
+            f"Database {path} attached to workspace test_attach as other"
+        data = json.loads(call('sqlite-query', {'workspace': 'test_attach', 'query': 'SELECT COUNT(*) AS count FROM other.users'}))
+        assert data['data'] == [{'count': 5}]
+        call('sqlite-workspace', {'action': 'detach', 'workspace': 'test_attach', 'alias': 'other'})
+    drop_workspace('test_attach')
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith('test_'):
+            test()
+            print(f"✅ {name}")